@@ -9,7 +9,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Optional
+from typing import Optional, Sequence
+
+
+# Stands in for {target} in the pre-rendered command.  NUL can't occur in
+# a template or path, so an escaped "{{target}}" stays literal.
+_TARGET_SENTINEL = "\x00"
 
 
 class TargetScope(Enum):
@@ -21,11 +26,14 @@ class TargetScope(Enum):
     EXTENSION = auto()        # HKCR\.ext\shell  (requires `extensions` list)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MenuEntry:
     """
     Immutable description of a single context-menu registration.
 
+    Frozen and slotted: use ``dataclasses.replace(entry, ...)`` to derive
+    a modified copy.  List inputs are stored as tuples so entries hash.
+
     Parameters
     ----------
     key_name : str
@@ -39,9 +47,9 @@ class MenuEntry:
         Default:  '"{exe_path}" "{target}"'
     icon : str | None
         Path to the icon. Can include index: "app.exe,0".
-    scopes : list[TargetScope]
+    scopes : Sequence[TargetScope]
         Where the entry should be registered.
-    extensions : list[str]
+    extensions : Sequence[str]
         Required when TargetScope.EXTENSION is in `scopes`.
         Each entry should include the leading dot, e.g. [".txt", ".py"].
     """
@@ -51,15 +59,16 @@ class MenuEntry:
     exe_path: str
     command_template: str = '"{exe_path}" "{target}"'
     icon: Optional[str] = None
-    scopes: list[TargetScope] = field(default_factory=lambda: [TargetScope.ALL_FILES])
-    extensions: list[str] = field(default_factory=list)
+    # Any sequence is accepted; __post_init__ stores both as tuples
+    scopes: Sequence[TargetScope] = (TargetScope.ALL_FILES,)
+    extensions: Sequence[str] = ()
+    _partial_command: str = field(init=False, repr=False, compare=False)
+    # Registry roots for EXTENSION scope, e.g. (r".txt\shell", r".py\shell")
+    ext_roots: tuple[str, ...] = field(init=False, repr=False, compare=False)
 
     def build_command(self, placeholder: str = "%1") -> str:
         """Render the final command string for the registry."""
-        return self.command_template.format(
-            exe_path=self.exe_path.replace("/", "\\"),
-            target=placeholder,
-        )
+        return self._partial_command.replace(_TARGET_SENTINEL, placeholder)
 
     def __post_init__(self) -> None:
         if TargetScope.EXTENSION in self.scopes and not self.extensions:
@@ -67,12 +76,21 @@ class MenuEntry:
                 f"MenuEntry '{self.key_name}': TargetScope.EXTENSION requires "
                 f"a non-empty `extensions` list."
             )
+        # Frozen dataclass — normalized values are stored via object.__setattr__
+        set_ = object.__setattr__
+        set_(self, "scopes", tuple(self.scopes))
         # Normalize paths: forward → backslashes (Windows Registry requirement)
-        self.exe_path = self.exe_path.replace("/", "\\")
+        set_(self, "exe_path", self.exe_path.replace("/", "\\"))
         if self.icon:
-            self.icon = self.icon.replace("/", "\\")
+            set_(self, "icon", self.icon.replace("/", "\\"))
         # Normalize extensions to include leading dot
-        self.extensions = [
+        set_(self, "extensions", tuple(
             ext if ext.startswith(".") else f".{ext}"
             for ext in self.extensions
-        ]
+        ))
+        set_(self, "ext_roots", tuple(f"{ext}\\shell" for ext in self.extensions))
+        # Render {exe_path} once; build_command only substitutes {target}
+        set_(self, "_partial_command", self.command_template.format(
+            exe_path=self.exe_path,
+            target=_TARGET_SENTINEL,
+        ))
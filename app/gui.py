@@ -7,100 +7,161 @@ a proper title bar, no URL bar, and its own taskbar presence.
 
 from __future__ import annotations
 
+import ctypes
 import os
 import sys
 import time
 import traceback
 import threading
-import urllib.request
+from ctypes import wintypes
+from pathlib import Path
+
+_kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+_user32 = ctypes.WinDLL("user32", use_last_error=True)
+
+# Typed signatures — keeps HANDLE/HWND values 64-bit clean
+_kernel32.CreateFileW.argtypes = [
+    wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+    wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE,
+]
+_kernel32.CreateFileW.restype = wintypes.HANDLE
+_kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+_kernel32.CloseHandle.restype = wintypes.BOOL
+_user32.FindWindowW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR]
+_user32.FindWindowW.restype = wintypes.HWND
+_user32.ShowWindow.argtypes = [wintypes.HWND, ctypes.c_int]
+_user32.ShowWindow.restype = wintypes.BOOL
+_user32.SetForegroundWindow.argtypes = [wintypes.HWND]
+_user32.SetForegroundWindow.restype = wintypes.BOOL
+_user32.LoadImageW.argtypes = [
+    wintypes.HINSTANCE, wintypes.LPCWSTR, wintypes.UINT,
+    ctypes.c_int, ctypes.c_int, wintypes.UINT,
+]
+_user32.LoadImageW.restype = wintypes.HANDLE
+_user32.SendMessageW.argtypes = [wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+_user32.SendMessageW.restype = wintypes.LPARAM
 
 _URL = "http://127.0.0.1:8787"
-_MUTEX_NAME = "Global\\ContextMenuCreator_SingleInstance"
-_mutex_handle = None
+_LOCK_FILE = os.path.join(
+    os.environ.get("LOCALAPPDATA", os.environ.get("TEMP", r"C:\temp")),
+    "ContextMenuCreator", "instance.lock",
+)
+_lock_handle = None
+_server_ready = threading.Event()
 
 
 def _acquire_single_instance_lock() -> bool:
-    """Try to acquire a system-wide mutex. Returns True if this is the only instance."""
-    global _mutex_handle
+    """
+    Try to open a per-user lock file exclusively. Returns True if this is the only instance.
+    The handle is held for the process lifetime; Windows deletes the file when it closes.
+    """
+    global _lock_handle
     try:
-        import ctypes
-        kernel32 = ctypes.windll.kernel32
-        ERROR_ALREADY_EXISTS = 183
-
-        _mutex_handle = kernel32.CreateMutexW(None, False, _MUTEX_NAME)
-        if kernel32.GetLastError() == ERROR_ALREADY_EXISTS:
-            kernel32.CloseHandle(_mutex_handle)
-            _mutex_handle = None
-            return False
+        GENERIC_WRITE = 0x40000000
+        OPEN_ALWAYS = 4
+        FILE_ATTRIBUTE_TEMPORARY = 0x00000100
+        FILE_FLAG_DELETE_ON_CLOSE = 0x04000000
+        ERROR_SHARING_VIOLATION = 32
+        INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+        os.makedirs(os.path.dirname(_LOCK_FILE), exist_ok=True)
+        handle = _kernel32.CreateFileW(
+            _LOCK_FILE, GENERIC_WRITE, 0,  # no sharing — a second open fails
+            None, OPEN_ALWAYS,
+            FILE_ATTRIBUTE_TEMPORARY | FILE_FLAG_DELETE_ON_CLOSE, None,
+        )
+        if handle in (None, INVALID_HANDLE_VALUE):
+            # Only a sharing violation means another instance holds the lock
+            return ctypes.get_last_error() != ERROR_SHARING_VIOLATION
+        _lock_handle = handle
         return True
     except Exception:
-        return True  # If mutex fails, allow launch anyway
+        return True  # If locking fails, allow launch anyway
+
+
+def _release_lock() -> None:
+    """Close the lock handle (deletes the lock file) so repeated launches in-process work."""
+    global _lock_handle
+    if _lock_handle:
+        _kernel32.CloseHandle(_lock_handle)
+        _lock_handle = None
 
 
 def _focus_existing_window():
     """Try to bring the existing instance's window to the foreground."""
     try:
-        import ctypes
-        user32 = ctypes.windll.user32
-        hwnd = user32.FindWindowW(None, "Context Menu Creator")
+        hwnd = _user32.FindWindowW(None, "Context Menu Creator")
         if hwnd:
             SW_RESTORE = 9
-            user32.ShowWindow(hwnd, SW_RESTORE)
-            user32.SetForegroundWindow(hwnd)
+            _user32.ShowWindow(hwnd, SW_RESTORE)
+            _user32.SetForegroundWindow(hwnd)
     except Exception:
         pass
 
 # Crash log in the centralized app data folder
 _CRASH_DIR = os.path.join(os.environ.get("TEMP", r"C:\temp"), "ContextMenuCreator")
-os.makedirs(_CRASH_DIR, exist_ok=True)
+if not os.path.isdir(_CRASH_DIR):
+    os.makedirs(_CRASH_DIR, exist_ok=True)
 _CRASH_LOG = os.path.join(_CRASH_DIR, "crash.log")
 
+# One line-buffered handle for the whole process — each message still
+# reaches disk immediately, without an open/close cycle per write.
+try:
+    _crash_fh = open(_CRASH_LOG, "a", encoding="utf-8", buffering=1)
+except OSError:
+    _crash_fh = None
+
 
 def _log_crash(msg: str) -> None:
     """Append error info to crash.log for debugging frozen builds."""
+    if _crash_fh is None:
+        return
     try:
-        with open(_CRASH_LOG, "a", encoding="utf-8") as f:
-            f.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {msg}\n")
+        _crash_fh.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {msg}\n")
     except Exception:
         pass
 
 
-def _wait_for_server(url: str, timeout: float = 10.0) -> bool:
-    """Block until the HTTP server responds (or timeout)."""
-    deadline = time.monotonic() + timeout
-    while time.monotonic() < deadline:
-        try:
-            urllib.request.urlopen(url, timeout=1)
-            return True
-        except Exception:
-            time.sleep(0.15)
-    return False
+def _exit(code: int) -> None:
+    """
+    Release process resources, then hard-exit.  `os._exit` skips atexit
+    (needed to stop lingering webview/server threads), so cleanup is explicit.
+    """
+    from app.logger_setup import shutdown_logging
+    shutdown_logging()  # flush queued log records, incl. the crash path
+    _release_lock()
+    if _crash_fh is not None:
+        _crash_fh.close()
+    os._exit(code)
 
 
 def _run_server() -> None:
     """Wrapper around start_server that catches and logs crashes."""
     try:
         from app.server import start_server
-        start_server()
+        start_server(ready_callback=_server_ready.set)
     except Exception:
         _log_crash("SERVER CRASH:\n" + traceback.format_exc())
 
 
 def launch() -> None:
-    """Show window instantly with loading page, then navigate once server is ready."""
+    """Start the server, show the loading page meanwhile, then navigate once ready."""
     try:
         # Single-instance guard
         if not _acquire_single_instance_lock():
             _focus_existing_window()
             sys.exit(0)
 
+        # Boot the server in parallel with webview initialization
+        server_thread = threading.Thread(target=_run_server, daemon=True)
+        server_thread.start()
+
+        import webview  # deliberately late: imports while the server thread boots
+
         from app.safety import is_admin
         if not is_admin():
             _log_crash("WARNING: Not running as Administrator")
 
-        import webview
-        from pathlib import Path
-
         # Resolve loading page as a file:/// URL
         if getattr(sys, 'frozen', False):
             _base = Path(sys._MEIPASS) / 'static'
@@ -141,13 +202,11 @@ def launch() -> None:
         def _set_window_icon():
             """Set the taskbar/title icon via Win32 API."""
             try:
-                import ctypes
-                from ctypes import wintypes
-                user32 = ctypes.windll.user32
-                shell32 = ctypes.windll.shell32
-
-                # Find the window by title
-                hwnd = user32.FindWindowW(None, "Context Menu Creator")
+                # The native WinForms form is live once `shown` fires
+                try:
+                    hwnd = window.native.Handle.ToInt64()
+                except AttributeError:
+                    hwnd = _user32.FindWindowW(None, "Context Menu Creator")
                 if not hwnd:
                     return
 
@@ -155,8 +214,8 @@ def launch() -> None:
                 IMAGE_ICON = 1
                 LR_LOADFROMFILE = 0x0010
                 LR_DEFAULTSIZE = 0x0040
-                ico = user32.LoadImageW(
-                    0, icon_path, IMAGE_ICON, 0, 0,
+                ico = _user32.LoadImageW(
+                    None, icon_path, IMAGE_ICON, 0, 0,
                     LR_LOADFROMFILE | LR_DEFAULTSIZE
                 )
                 if not ico:
@@ -165,32 +224,30 @@ def launch() -> None:
                 WM_SETICON = 0x0080
                 ICON_SMALL = 0
                 ICON_BIG = 1
-                user32.SendMessageW(hwnd, WM_SETICON, ICON_SMALL, ico)
-                user32.SendMessageW(hwnd, WM_SETICON, ICON_BIG, ico)
+                _user32.SendMessageW(hwnd, WM_SETICON, ICON_SMALL, ico)
+                _user32.SendMessageW(hwnd, WM_SETICON, ICON_BIG, ico)
             except Exception:
                 pass  # Non-critical — fallback to default icon
 
-        def _boot_server_then_navigate():
-            """Start server + navigate once ready (runs after webview is live)."""
-            _set_window_icon()
-
-            server_thread = threading.Thread(target=_run_server, daemon=True)
-            server_thread.start()
-
-            ready = _wait_for_server(_URL)
+        def _navigate_when_ready():
+            """Navigate once the server is ready (runs after webview is live)."""
+            # Signalled by the server thread once the socket is listening
+            ready = _server_ready.wait(10.0)
             if ready:
                 window.load_url(_URL)
             else:
                 _log_crash("Server did not become ready within 10s timeout")
 
-        # Start the server AFTER the webview event loop begins
-        webview.start(func=_boot_server_then_navigate)
+        # Icon needs a real HWND — set it once the window is actually shown
+        window.events.shown += _set_window_icon
+
+        webview.start(func=_navigate_when_ready)
 
-        os._exit(0)
+        _exit(0)
 
     except Exception:
         _log_crash("LAUNCH CRASH:\n" + traceback.format_exc())
-        os._exit(1)
+        _exit(1)
 
 
 if __name__ == "__main__":
@@ -4,23 +4,41 @@ All modules import `get_logger` to get a child logger
 scoped to their module name.
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator
 
 # Logs always go to a fixed, user-accessible location.
 _LOG_DIR = Path(os.environ.get("TEMP", r"C:\temp")) / "ContextMenuCreator" / "logs"
 _LOG_FILE = _LOG_DIR / "context_menu.log"
 _INITIALIZED = False
+_INIT_LOCK = threading.Lock()
+_FILE_HANDLER: logging.FileHandler | None = None
+_LISTENER: logging.handlers.QueueListener | None = None
 
 
 def _init_root_logger() -> None:
-    """Configure the root logger once."""
+    """Configure the root logger once (safe to race from request threads)."""
     global _INITIALIZED
     if _INITIALIZED:
         return
+    with _INIT_LOCK:
+        if _INITIALIZED:
+            return
+        _configure()
+        _INITIALIZED = True
 
+
+def _configure() -> None:
+    """Install the handlers — called once, under `_INIT_LOCK`."""
+    global _FILE_HANDLER, _LISTENER
     _LOG_DIR.mkdir(parents=True, exist_ok=True)
 
     root = logging.getLogger("ctxmenu")
@@ -34,7 +52,14 @@ def _init_root_logger() -> None:
         datefmt="%Y-%m-%d %H:%M:%S",
     ))
 
-    root.addHandler(fh)
+    _FILE_HANDLER = fh
+
+    # Callers only enqueue; a listener thread does the disk writes
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    _LISTENER = logging.handlers.QueueListener(log_queue, fh, respect_handler_level=True)
+    _LISTENER.start()
+    atexit.register(shutdown_logging)
 
     # ── Console handler (compact) ───────────────────────────────
     # Skip console output in frozen windowed apps (no stdout)
@@ -51,7 +76,35 @@ def _init_root_logger() -> None:
         ch.setFormatter(logging.Formatter("%(levelname)-8s | %(message)s"))
         root.addHandler(ch)
 
-    _INITIALIZED = True
+
+def shutdown_logging() -> None:
+    """
+    Drain queued records to disk and stop the writer thread.  Runs at exit;
+    call it directly before `os._exit`, which skips atexit.  Idempotent.
+    """
+    global _LISTENER
+    with _INIT_LOCK:
+        listener, _LISTENER = _LISTENER, None
+    if listener is not None:
+        listener.stop()
+
+
+@contextmanager
+def released_log_file() -> Iterator[None]:
+    """
+    Close the log file for the duration of the block so it can be renamed
+    or replaced (Windows refuses while it is open).  Writes wait on the
+    handler lock meanwhile; the handler reopens the file on the next record.
+    """
+    fh = _FILE_HANDLER
+    if fh is None:
+        yield
+        return
+    with fh.lock:
+        if fh.stream:
+            fh.stream.close()
+            fh.stream = None
+        yield
 
 
 def get_logger(name: str) -> logging.Logger:
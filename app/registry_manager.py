@@ -3,12 +3,21 @@ Registry Manager — the ONLY module that touches winreg.
 
 All operations route through `add_entry` / `remove_entry`.
 Dry-run mode logs what WOULD happen without writing.
+
+Writes are never followed by FlushKey: the kernel lazy-writes the hive,
+and a forced flush costs tens of milliseconds per call for no benefit
+to a context-menu entry.  Keep it that way.
 """
 
 from __future__ import annotations
 
+import ctypes
+import os
+import threading
 import winreg
-from typing import Optional
+from contextlib import contextmanager
+from ctypes import wintypes
+from typing import Iterable, Iterator, Optional
 
 from app.config import MenuEntry, TargetScope
 from app.safety import require_admin, validate_exe_path, validate_icon_path
@@ -16,22 +25,208 @@ from app.logger_setup import get_logger
 
 log = get_logger("registry")
 
-# ── Scope → Registry root path mapping ─────────────────────────
-_SCOPE_ROOTS: dict[TargetScope, str] = {
-    TargetScope.ALL_FILES:      r"*\shell",
-    TargetScope.DIRECTORY:      r"Directory\shell",
-    TargetScope.DIR_BACKGROUND: r"Directory\Background\shell",
-    # EXTENSION is dynamic — handled separately
-}
-
+# ── Scope → (registry root path, command placeholder) ──────────
 # %1 = selected file path, %V = current directory path
-_SCOPE_PLACEHOLDER: dict[TargetScope, str] = {
-    TargetScope.ALL_FILES:      "%1",
-    TargetScope.DIRECTORY:      "%V",
-    TargetScope.DIR_BACKGROUND: "%V",
-    TargetScope.EXTENSION:      "%1",
+_SCOPE_INFO: dict[TargetScope, tuple[Optional[str], str]] = {
+    TargetScope.ALL_FILES:      (r"*\shell", "%1"),
+    TargetScope.DIRECTORY:      (r"Directory\shell", "%V"),
+    TargetScope.DIR_BACKGROUND: (r"Directory\Background\shell", "%V"),
+    # EXTENSION roots are per-extension — see MenuEntry.ext_roots
+    TargetScope.EXTENSION:      (None, "%1"),
 }
 
+# ── Kernel Transaction Manager (transacted registry writes) ────
+_kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+_ktmw32 = ctypes.WinDLL("ktmw32", use_last_error=True)
+_advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
+
+_INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+_ktmw32.CreateTransaction.argtypes = [
+    wintypes.LPVOID, wintypes.LPVOID, wintypes.DWORD, wintypes.DWORD,
+    wintypes.DWORD, wintypes.DWORD, wintypes.LPWSTR,
+]
+_ktmw32.CreateTransaction.restype = wintypes.HANDLE
+_ktmw32.CommitTransaction.argtypes = [wintypes.HANDLE]
+_ktmw32.CommitTransaction.restype = wintypes.BOOL
+_ktmw32.RollbackTransaction.argtypes = [wintypes.HANDLE]
+_ktmw32.RollbackTransaction.restype = wintypes.BOOL
+_kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+_kernel32.CloseHandle.restype = wintypes.BOOL
+
+_advapi32.RegCreateKeyTransactedW.argtypes = [
+    wintypes.HKEY, wintypes.LPCWSTR, wintypes.DWORD, wintypes.LPWSTR,
+    wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+    ctypes.POINTER(wintypes.HKEY), wintypes.LPDWORD,
+    wintypes.HANDLE, wintypes.LPVOID,
+]
+_advapi32.RegCreateKeyTransactedW.restype = wintypes.LONG
+_advapi32.RegSetValueExW.argtypes = [
+    wintypes.HKEY, wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD,
+    wintypes.LPCVOID, wintypes.DWORD,
+]
+_advapi32.RegSetValueExW.restype = wintypes.LONG
+_advapi32.RegCloseKey.argtypes = [wintypes.HKEY]
+_advapi32.RegCloseKey.restype = wintypes.LONG
+_advapi32.RegQueryInfoKeyW.argtypes = [
+    wintypes.HKEY, wintypes.LPWSTR, wintypes.LPDWORD, wintypes.LPDWORD,
+    wintypes.LPDWORD, wintypes.LPDWORD, wintypes.LPDWORD, wintypes.LPDWORD,
+    wintypes.LPDWORD, wintypes.LPDWORD, wintypes.LPDWORD, wintypes.LPVOID,
+]
+_advapi32.RegQueryInfoKeyW.restype = wintypes.LONG
+_advapi32.RegEnumKeyExW.argtypes = [
+    wintypes.HKEY, wintypes.DWORD, wintypes.LPWSTR, wintypes.LPDWORD,
+    wintypes.LPDWORD, wintypes.LPWSTR, wintypes.LPDWORD, wintypes.LPVOID,
+]
+_advapi32.RegEnumKeyExW.restype = wintypes.LONG
+_advapi32.RegGetValueW.argtypes = [
+    wintypes.HKEY, wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD,
+    wintypes.LPDWORD, wintypes.LPVOID, wintypes.LPDWORD,
+]
+_advapi32.RegGetValueW.restype = wintypes.LONG
+
+# ── Shell tray window (graceful Explorer restart) ──────────────
+_user32 = ctypes.WinDLL("user32", use_last_error=True)
+_user32.FindWindowW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR]
+_user32.FindWindowW.restype = wintypes.HWND
+_user32.PostMessageW.argtypes = [wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+_user32.PostMessageW.restype = wintypes.BOOL
+_user32.GetWindowThreadProcessId.argtypes = [wintypes.HWND, wintypes.LPDWORD]
+_user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+_kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+_kernel32.OpenProcess.restype = wintypes.HANDLE
+_kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+_kernel32.WaitForSingleObject.restype = wintypes.DWORD
+
+_advapi32.RegDeleteKeyExW.argtypes = [wintypes.HKEY, wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD]
+_advapi32.RegDeleteKeyExW.restype = wintypes.LONG
+_advapi32.RegNotifyChangeKeyValue.argtypes = [
+    wintypes.HKEY, wintypes.BOOL, wintypes.DWORD, wintypes.HANDLE, wintypes.BOOL,
+]
+_advapi32.RegNotifyChangeKeyValue.restype = wintypes.LONG
+_kernel32.CreateEventW.argtypes = [wintypes.LPVOID, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR]
+_kernel32.CreateEventW.restype = wintypes.HANDLE
+
+_REG_NOTIFY_CHANGE_NAME = 0x00000001
+_REG_NOTIFY_CHANGE_LAST_SET = 0x00000004
+_INFINITE = 0xFFFFFFFF
+
+_WM_EXIT_EXPLORER = 0x5B4  # undocumented but stable: tray asks Explorer to exit cleanly
+_SYNCHRONIZE = 0x00100000
+_WAIT_OBJECT_0 = 0
+
+_ERROR_FILE_NOT_FOUND = 2
+_ERROR_INVALID_DATA = 13
+_ERROR_MORE_DATA = 234
+_ERROR_UNSUPPORTED_TYPE = 1630
+# Statuses where the value exists but is not a usable string (e.g. a
+# third-party verb with a REG_DWORD Icon) — treated like a missing value
+_NOT_A_STRING = frozenset({_ERROR_FILE_NOT_FOUND, _ERROR_INVALID_DATA, _ERROR_UNSUPPORTED_TYPE})
+# REG_SZ or REG_EXPAND_SZ, returned unexpanded (same as winreg.QueryValueEx)
+_RRF_RT_ANY_SZ = 0x00000002 | 0x00000004 | 0x10000000
+
+
+def _create_key_transacted(parent: int, sub_key: str, txn: int) -> int:
+    """Create/open `sub_key` under `parent` inside transaction `txn`."""
+    hkey = wintypes.HKEY()
+    status = _advapi32.RegCreateKeyTransactedW(
+        parent, sub_key, 0, None, 0, winreg.KEY_WRITE, None,
+        ctypes.byref(hkey), None, txn, None,
+    )
+    if status != 0:
+        raise ctypes.WinError(status)
+    return hkey.value
+
+
+def _set_sz(hkey: int, name: str, value: str) -> None:
+    """Write a REG_SZ value on an already-open key handle."""
+    # create_unicode_buffer would take an int as a buffer size and write NULs
+    if not isinstance(value, str):
+        raise TypeError(f"registry value {name!r} must be str, not {type(value).__name__}")
+    buf = ctypes.create_unicode_buffer(value)
+    status = _advapi32.RegSetValueExW(
+        hkey, name, 0, winreg.REG_SZ, buf, ctypes.sizeof(buf),
+    )
+    if status != 0:
+        raise ctypes.WinError(status)
+
+
+def _enum_subkeys(key: winreg.HKEYType) -> list[str]:
+    """
+    Return all subkey names of an open key.
+
+    Sizes one name buffer from RegQueryInfoKeyW and reuses it for every
+    RegEnumKeyExW call; falls back to winreg.EnumKey on any API error.
+    """
+    count = wintypes.DWORD()
+    max_len = wintypes.DWORD()
+    status = _advapi32.RegQueryInfoKeyW(
+        key.handle, None, None, None, ctypes.byref(count), ctypes.byref(max_len),
+        None, None, None, None, None, None,
+    )
+    if status != 0:
+        return [winreg.EnumKey(key, i) for i in range(winreg.QueryInfoKey(key)[0])]
+
+    buf = ctypes.create_unicode_buffer(max_len.value + 1)
+    size = wintypes.DWORD()
+    names: list[str] = []
+    for i in range(count.value):
+        size.value = len(buf)
+        status = _advapi32.RegEnumKeyExW(
+            key.handle, i, buf, ctypes.byref(size), None, None, None, None,
+        )
+        if status != 0:
+            names.append(winreg.EnumKey(key, i))
+        else:
+            names.append(buf.value)
+    return names
+
+
+def _get_sz(hkey: int, sub_key: Optional[str], name: str, buf: ctypes.Array) -> Optional[str]:
+    """
+    Read a string value with RegGetValueW, reusing `buf` when it is large enough.
+    Returns None if the subkey or value does not exist, or is not a string.
+    """
+    size = wintypes.DWORD(ctypes.sizeof(buf))
+    status = _advapi32.RegGetValueW(
+        hkey, sub_key, name, _RRF_RT_ANY_SZ, None, buf, ctypes.byref(size),
+    )
+    if status == _ERROR_MORE_DATA:
+        buf = ctypes.create_unicode_buffer(size.value // ctypes.sizeof(ctypes.c_wchar) + 1)
+        size.value = ctypes.sizeof(buf)
+        status = _advapi32.RegGetValueW(
+            hkey, sub_key, name, _RRF_RT_ANY_SZ, None, buf, ctypes.byref(size),
+        )
+    if status in _NOT_A_STRING:
+        return None
+    if status != 0:
+        raise ctypes.WinError(status)
+    return buf.value
+
+
+def _read_details(
+    root: int, key_name: str, buf: ctypes.Array,
+) -> tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    (display_name, icon, command) of `key_name` under an open scope root.
+    RegGetValueW resolves the subkey path itself, so the entry key is never
+    opened; icon/command are skipped (None) when display_name is missing.
+    """
+    display_name = _get_sz(root, key_name, "", buf)
+    if display_name is None:
+        return None, None, None
+    icon = _get_sz(root, key_name, "Icon", buf)
+    command = _get_sz(root, rf"{key_name}\command", "", buf)
+    return display_name, icon, command
+
+
+def _icon_is_exe(icon: Optional[str], exe_path: str) -> bool:
+    """True if `icon` (optionally with a ",N" index) points at `exe_path` itself."""
+    if not icon:
+        return False
+    raw = icon.split(",")[0].strip()
+    return os.path.normcase(os.path.normpath(raw)) == os.path.normcase(os.path.normpath(exe_path))
+
 
 class RegistryManager:
     """
@@ -45,6 +240,9 @@ class RegistryManager:
 
     def __init__(self, dry_run: bool = False) -> None:
         self.dry_run = dry_run
+        # Classic-menu state, kept fresh by a registry change watcher
+        self._classic_menu: Optional[bool] = None
+        self._classic_watching = False
         if dry_run:
             log.info("══════ DRY-RUN MODE — no registry changes will be made ══════")
 
@@ -52,32 +250,50 @@ class RegistryManager:
 
     def add_entry(self, entry: MenuEntry) -> None:
         """Register a context-menu entry across all requested scopes."""
+        self.add_entries([entry])
+
+    def add_entries(self, entries: Iterable[MenuEntry]) -> None:
+        """
+        Register several entries in one go.
+        Admin is checked once, each distinct exe/icon is validated once,
+        and all writes commit in a single transaction (all-or-nothing).
+        """
         require_admin()
-        exe = validate_exe_path(entry.exe_path)
-        icon = validate_icon_path(entry.icon)
+        entries = list(entries)
 
-        for scope in entry.scopes:
-            if scope == TargetScope.EXTENSION:
-                for ext in entry.extensions:
-                    root = rf"{ext}\shell"
-                    self._write_entry(root, entry, _SCOPE_PLACEHOLDER[scope], icon)
+        for exe_path in {e.exe_path for e in entries}:
+            validate_exe_path(exe_path)
+
+        icons: dict[tuple[Optional[str], str], Optional[str]] = {}
+        for e in entries:
+            if (e.icon, e.exe_path) in icons:
+                continue
+            if _icon_is_exe(e.icon, e.exe_path):
+                icons[e.icon, e.exe_path] = e.icon  # "<exe>,N" — exe validated above
             else:
-                root = _SCOPE_ROOTS[scope]
-                self._write_entry(root, entry, _SCOPE_PLACEHOLDER[scope], icon)
+                icons[e.icon, e.exe_path] = validate_icon_path(e.icon)
 
-        log.info("✔ Entry '%s' registered successfully.", entry.key_name)
+        # Everything commits together — a failure part-way leaves nothing half-written
+        with self._transaction() as txn:
+            for e in entries:
+                icon = icons[e.icon, e.exe_path]
+                for scope in e.scopes:
+                    root, placeholder = _SCOPE_INFO[scope]
+                    roots = e.ext_roots if root is None else (root,)
+                    for root in roots:
+                        self._write_entry(root, e, placeholder, icon, txn)
+
+        for e in entries:
+            log.info("✔ Entry '%s' registered successfully.", e.key_name)
 
     def remove_entry(self, entry: MenuEntry) -> None:
         """Remove a context-menu entry from all its scopes."""
         require_admin()
 
         for scope in entry.scopes:
-            if scope == TargetScope.EXTENSION:
-                for ext in entry.extensions:
-                    root = rf"{ext}\shell"
-                    self._delete_entry(root, entry.key_name)
-            else:
-                root = _SCOPE_ROOTS[scope]
+            root = _SCOPE_INFO[scope][0]
+            roots = entry.ext_roots if root is None else (root,)
+            for root in roots:
                 self._delete_entry(root, entry.key_name)
 
         log.info("✔ Entry '%s' removed successfully.", entry.key_name)
@@ -92,60 +308,176 @@ class RegistryManager:
                 raise ValueError("Must provide `extension` for EXTENSION scope.")
             root = rf"{extension}\shell"
         else:
-            root = _SCOPE_ROOTS[scope]
+            root = _SCOPE_INFO[scope][0]
 
         try:
             with winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, root) as key:
-                count = winreg.QueryInfoKey(key)[0]  # number of subkeys
-                return [winreg.EnumKey(key, i) for i in range(count)]
+                return _enum_subkeys(key)
         except FileNotFoundError:
             return []
 
+    def list_entries_bulk(self, scopes: Iterable[TargetScope]) -> dict[TargetScope, list[str]]:
+        """
+        List the subkeys of several fixed-root scopes, opening each root once.
+        Returns {scope: [key names]} in the order given; EXTENSION is skipped.
+        """
+        result: dict[TargetScope, list[str]] = {}
+        for scope in scopes:
+            root = _SCOPE_INFO[scope][0]
+            if root is None:
+                continue
+            try:
+                with winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, root, 0, winreg.KEY_READ) as key:
+                    result[scope] = _enum_subkeys(key)
+            except FileNotFoundError:
+                result[scope] = []
+        return result
+
     def read_entry_details(self, scope: TargetScope, key_name: str) -> dict | None:
         """
         Read display_name, icon, and command from an existing registry entry.
         Returns a dict or None if not found.
         """
-        root = _SCOPE_ROOTS.get(scope)
+        root = _SCOPE_INFO[scope][0]
         if root is None:
             return None
 
         key_path = rf"{root}\{key_name}"
+        buf = ctypes.create_unicode_buffer(1024)  # shared by all three reads
         try:
             with winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, key_path) as key:
-                display_name = winreg.QueryValueEx(key, "")[0]
-                try:
-                    icon = winreg.QueryValueEx(key, "Icon")[0]
-                except FileNotFoundError:
-                    icon = None
+                display_name = _get_sz(key.handle, None, "", buf)
+                if display_name is None:
+                    return None
+                icon = _get_sz(key.handle, None, "Icon", buf)
+                command = _get_sz(key.handle, "command", "", buf)
         except FileNotFoundError:
             return None
 
-        cmd_path = rf"{key_path}\command"
-        try:
-            with winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, cmd_path) as key:
-                command = winreg.QueryValueEx(key, "")[0]
-        except FileNotFoundError:
-            command = None
-
         return {
             "display_name": display_name,
             "icon": icon,
             "command": command,
         }
 
+    def read_entries_details_bulk(
+        self, scope: TargetScope, keys: Iterable[str],
+    ) -> dict[str, dict | None]:
+        """
+        Like `read_entry_details` for many keys of one scope, opening the
+        scope root once.  Returns {key_name: details or None}; None also
+        marks a key whose details could not be read.
+        """
+        keys = list(keys)
+        root = _SCOPE_INFO[scope][0]
+        if root is None:
+            return dict.fromkeys(keys)
+
+        result: dict[str, dict | None] = {}
+        buf = ctypes.create_unicode_buffer(1024)  # shared by every read
+        try:
+            with winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, root) as key:
+                for key_name in keys:
+                    try:
+                        display_name, icon, command = _read_details(key.handle, key_name, buf)
+                    except OSError as exc:
+                        # Same as read_all_entries: one bad key can't sink the batch
+                        log.warning("Could not read entry '%s': %s", key_name, exc)
+                        result[key_name] = None
+                        continue
+                    result[key_name] = None if display_name is None else {
+                        "display_name": display_name,
+                        "icon": icon,
+                        "command": command,
+                    }
+        except FileNotFoundError:
+            return dict.fromkeys(keys)
+        return result
+
+    def read_all_entries(self, scopes: Iterable[TargetScope]) -> dict[str, dict]:
+        """
+        Read every entry under the given scopes in one walk per scope root.
+
+        Returns {key_name: {"scopes", "display_name", "icon", "command"}} in
+        first-seen order.  Details come from the first scope a key appears
+        in; display_name is None if that key has no default value or its
+        details could not be read.
+        EXTENSION scope is skipped (it has no fixed root).
+        """
+        result: dict[str, dict] = {}
+        buf = ctypes.create_unicode_buffer(1024)  # shared by every read
+        for scope in scopes:
+            root = _SCOPE_INFO[scope][0]
+            if root is None:
+                continue
+            try:
+                with winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, root) as key:
+                    for key_name in _enum_subkeys(key):
+                        info = result.get(key_name)
+                        if info is not None:
+                            info["scopes"].append(scope)
+                            continue
+                        try:
+                            display_name, icon, command = _read_details(key.handle, key_name, buf)
+                        except OSError as exc:
+                            # One unreadable entry (ACL-locked key, oversized
+                            # value) must not hide all the others
+                            log.warning("Could not read entry '%s': %s", key_name, exc)
+                            display_name = icon = command = None
+                        result[key_name] = {
+                            "scopes": [scope],
+                            "display_name": display_name,
+                            "icon": icon,
+                            "command": command,
+                        }
+            except FileNotFoundError:
+                continue
+        return result
+
     # ── Internal helpers ────────────────────────────────────────
 
+    @contextmanager
+    def _transaction(self) -> Iterator[Optional[int]]:
+        """
+        Yield a KTM transaction handle for grouped registry writes.
+
+        Commits when the block exits cleanly, rolls back on exception.
+        Yields None in dry-run mode or when KTM is unavailable, in which
+        case writes fall back to plain (non-transacted) winreg calls.
+        """
+        if self.dry_run:
+            yield None
+            return
+
+        txn = _ktmw32.CreateTransaction(None, None, 0, 0, 0, 0, "ContextMenuCreator")
+        if txn in (None, _INVALID_HANDLE_VALUE):
+            log.warning("Registry transaction unavailable — writing without one.")
+            yield None
+            return
+
+        # No explicit flush — CommitTransaction alone orders the writes
+        try:
+            yield txn
+        except BaseException:
+            _ktmw32.RollbackTransaction(txn)
+            log.warning("Registry transaction rolled back.")
+            raise
+        else:
+            if not _ktmw32.CommitTransaction(txn):
+                raise ctypes.WinError(ctypes.get_last_error())
+        finally:
+            _kernel32.CloseHandle(txn)
+
     def _write_entry(
         self,
         root: str,
         entry: MenuEntry,
         placeholder: str,
         icon: Optional[str],
+        txn: Optional[int] = None,
     ) -> None:
         r"""Create the shell\<key>\command tree under `root`."""
         key_path = rf"{root}\{entry.key_name}"
-        cmd_path = rf"{key_path}\command"
         command = entry.build_command(placeholder)
 
         if self.dry_run:
@@ -156,21 +488,33 @@ class RegistryManager:
             log.info("[DRY-RUN]   command  = %s", command)
             return
 
-        # Create parent key + set display name
-        with winreg.CreateKeyEx(
-            winreg.HKEY_CLASSES_ROOT, key_path,
-            access=winreg.KEY_SET_VALUE,
-        ) as key:
-            winreg.SetValueEx(key, "", 0, winreg.REG_SZ, entry.display_name)
-            if icon:
-                winreg.SetValueEx(key, "Icon", 0, winreg.REG_SZ, icon)
-
-        # Create command subkey
-        with winreg.CreateKeyEx(
-            winreg.HKEY_CLASSES_ROOT, cmd_path,
-            access=winreg.KEY_SET_VALUE,
-        ) as key:
-            winreg.SetValueEx(key, "", 0, winreg.REG_SZ, command)
+        if txn is not None:
+            # Parent key + command subkey opened once each, inside the transaction
+            hkey = _create_key_transacted(winreg.HKEY_CLASSES_ROOT, key_path, txn)
+            try:
+                _set_sz(hkey, "", entry.display_name)
+                if icon:
+                    _set_sz(hkey, "Icon", icon)
+                hcmd = _create_key_transacted(hkey, "command", txn)
+                try:
+                    _set_sz(hcmd, "", command)
+                finally:
+                    _advapi32.RegCloseKey(hcmd)
+            finally:
+                _advapi32.RegCloseKey(hkey)
+        else:
+            # Create parent key + set display name
+            with winreg.CreateKeyEx(
+                winreg.HKEY_CLASSES_ROOT, key_path,
+                access=winreg.KEY_WRITE,
+            ) as key:
+                winreg.SetValueEx(key, "", 0, winreg.REG_SZ, entry.display_name)
+                if icon:
+                    winreg.SetValueEx(key, "Icon", 0, winreg.REG_SZ, icon)
+
+                # Create command subkey relative to the open parent
+                with winreg.CreateKeyEx(key, "command", access=winreg.KEY_SET_VALUE) as cmd_key:
+                    winreg.SetValueEx(cmd_key, "", 0, winreg.REG_SZ, command)
 
         log.debug("Created: HKCR\\%s → %s", key_path, command)
 
@@ -200,17 +544,69 @@ class RegistryManager:
 
     # This CLSID disables the modern compact menu when its
     # InprocServer32 default value is set to an empty string.
-    _WIN11_CLSID = r"Software\Classes\CLSID\{86ca1aa0-34aa-4e8b-a509-50c905bae2a2}\InprocServer32"
+    # Every access uses KEY_WOW64_64KEY: Explorer reads the 64-bit view,
+    # and a 32-bit build must not create/read/delete the WOW6432Node copy.
+    _CLSID_ROOT = r"Software\Classes\CLSID"
+    _WIN11_CLSID_PARENT = rf"{_CLSID_ROOT}\{{86ca1aa0-34aa-4e8b-a509-50c905bae2a2}}"
+    _WIN11_CLSID = rf"{_WIN11_CLSID_PARENT}\InprocServer32"
 
     def is_classic_menu_forced(self) -> bool:
-        """Check if Windows 11 is set to always show the classic menu."""
+        """
+        Check if Windows 11 is set to always show the classic menu.
+        The first call reads the registry and starts a change watcher;
+        later calls return the watched value without touching the registry.
+        """
+        if self._classic_menu is not None:
+            return self._classic_menu
+
+        state = self._read_classic_menu()
+        if not self._classic_watching:
+            self._classic_watching = True
+            self._classic_menu = state
+            threading.Thread(target=self._watch_classic_menu, daemon=True).start()
+        return state
+
+    def _read_classic_menu(self) -> bool:
         try:
-            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, self._WIN11_CLSID) as key:
+            with winreg.OpenKey(
+                winreg.HKEY_CURRENT_USER, self._WIN11_CLSID,
+                access=winreg.KEY_QUERY_VALUE | winreg.KEY_WOW64_64KEY,
+            ) as key:
                 val, _ = winreg.QueryValueEx(key, "")
                 return val == ""
         except (FileNotFoundError, OSError):
             return False
 
+    def _watch_classic_menu(self) -> None:
+        r"""Re-read the classic-menu state whenever HKCU\...\CLSID changes."""
+        try:
+            # Watch the always-present CLSID root — the entry itself may not exist yet
+            with winreg.OpenKey(
+                winreg.HKEY_CURRENT_USER, self._CLSID_ROOT,
+                access=winreg.KEY_NOTIFY | winreg.KEY_WOW64_64KEY,
+            ) as key:
+                event = _kernel32.CreateEventW(None, False, False, None)
+                if not event:
+                    return
+                try:
+                    while True:
+                        status = _advapi32.RegNotifyChangeKeyValue(
+                            key.handle, True,
+                            _REG_NOTIFY_CHANGE_NAME | _REG_NOTIFY_CHANGE_LAST_SET,
+                            event, True,
+                        )
+                        if status != 0:
+                            break
+                        # Read after arming so no change slips between the two
+                        self._classic_menu = self._read_classic_menu()
+                        _kernel32.WaitForSingleObject(event, _INFINITE)
+                finally:
+                    _kernel32.CloseHandle(event)
+        except OSError:
+            pass
+        # Watcher gone — fall back to reading on every call
+        self._classic_menu = None
+
     def force_classic_menu(self) -> None:
         """
         Force Windows 11 to always show the full classic context menu
@@ -223,9 +619,10 @@ class RegistryManager:
 
         with winreg.CreateKeyEx(
             winreg.HKEY_CURRENT_USER, self._WIN11_CLSID,
-            access=winreg.KEY_SET_VALUE,
+            access=winreg.KEY_SET_VALUE | winreg.KEY_WOW64_64KEY,
         ) as key:
             winreg.SetValueEx(key, "", 0, winreg.REG_SZ, "")
+        self._classic_menu = True  # don't wait for the watcher to catch up
 
         log.info("✔ Classic menu forced. Restart Explorer to apply.")
 
@@ -238,27 +635,50 @@ class RegistryManager:
             log.info("[DRY-RUN] Would restore modern Win11 menu")
             return
 
-        try:
-            winreg.DeleteKey(
-                winreg.HKEY_CURRENT_USER,
-                self._WIN11_CLSID,
-            )
-            # Also clean up parent CLSID key if empty
-            parent = r"Software\Classes\CLSID\{86ca1aa0-34aa-4e8b-a509-50c905bae2a2}"
-            try:
-                winreg.DeleteKey(winreg.HKEY_CURRENT_USER, parent)
-            except OSError:
-                pass
-            log.info("✔ Modern menu restored. Restart Explorer to apply.")
-        except FileNotFoundError:
+        # 64-bit view, like every other classic-menu access (Explorer is 64-bit)
+        status = _advapi32.RegDeleteKeyExW(
+            winreg.HKEY_CURRENT_USER, self._WIN11_CLSID, winreg.KEY_WOW64_64KEY, 0,
+        )
+        if status == _ERROR_FILE_NOT_FOUND:
             log.info("Modern menu is already active.")
+            return
+        if status != 0:
+            raise ctypes.WinError(status)
+        self._classic_menu = False
+
+        # Also clean up parent CLSID key if empty (fails harmlessly otherwise)
+        _advapi32.RegDeleteKeyExW(
+            winreg.HKEY_CURRENT_USER, self._WIN11_CLSID_PARENT, winreg.KEY_WOW64_64KEY, 0,
+        )
+        log.info("✔ Modern menu restored. Restart Explorer to apply.")
 
     @staticmethod
     def restart_explorer() -> None:
-        """Kill and restart explorer.exe to apply menu changes."""
+        """
+        Restart explorer.exe to apply menu changes.
+        Asks the shell tray window to exit cleanly; falls back to taskkill
+        if that can't be requested or Explorer is still running after 5 s.
+        """
         import subprocess
         log.info("Restarting Explorer…")
-        subprocess.run(["taskkill", "/f", "/im", "explorer.exe"],
-                       capture_output=True)
-        subprocess.Popen(["explorer.exe"])
+
+        exited = False
+        hwnd = _user32.FindWindowW("Shell_TrayWnd", None)
+        if hwnd and _user32.PostMessageW(hwnd, _WM_EXIT_EXPLORER, 0, 0):
+            pid = wintypes.DWORD()
+            _user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+            proc = _kernel32.OpenProcess(_SYNCHRONIZE, False, pid.value)
+            if proc:
+                exited = _kernel32.WaitForSingleObject(proc, 5000) == _WAIT_OBJECT_0
+                _kernel32.CloseHandle(proc)
+
+        if not exited:
+            # No tray, post failed, or Explorer didn't exit in time — force it
+            log.debug("Explorer did not exit cleanly; falling back to taskkill")
+            subprocess.run(["taskkill", "/f", "/im", "explorer.exe"],
+                           capture_output=True)
+
+        # The shell may already have relaunched itself (AutoRestartShell)
+        if not _user32.FindWindowW("Shell_TrayWnd", None):
+            subprocess.Popen(["explorer.exe"])
         log.info("✔ Explorer restarted.")
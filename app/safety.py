@@ -3,7 +3,10 @@ Safety utilities — run BEFORE any registry operation.
 """
 
 import ctypes
+import errno
+import functools
 import os
+import stat
 from pathlib import Path
 
 from app.logger_setup import get_logger
@@ -11,8 +14,12 @@ from app.logger_setup import get_logger
 log = get_logger("safety")
 
 
+@functools.lru_cache(maxsize=1)
 def is_admin() -> bool:
-    """Return True if the current process has Administrator privileges."""
+    """
+    Return True if the current process has Administrator privileges.
+    Elevation can't change within a process, so the result is cached.
+    """
     try:
         return ctypes.windll.shell32.IsUserAnAdmin() != 0
     except AttributeError:
@@ -31,15 +38,34 @@ def require_admin() -> None:
         raise PermissionError(msg)
 
 
+def _resolve_and_stat(path: str) -> tuple[Path, bool]:
+    """
+    Resolve `path` and stat it once.  Returns (resolved_path, is_regular_file).
+    Raises FileNotFoundError if nothing exists at the path.  Deliberately
+    uncached: files can vanish while the GUI server runs, and callers
+    already dedupe paths per batch.
+    """
+    if os.path.isabs(path):
+        p = Path(os.path.normpath(path))
+    else:
+        p = Path(path).resolve()
+    try:
+        st = os.stat(p)
+    except OSError:
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), str(p)) from None
+    return p, stat.S_ISREG(st.st_mode)
+
+
 def validate_exe_path(path: str) -> Path:
     """
     Confirm the executable exists, is a file, and ends with .exe.
     Returns a resolved Path object.
     """
-    p = Path(path).resolve()
-    if not p.exists():
-        raise FileNotFoundError(f"Executable not found: {p}")
-    if not p.is_file():
+    try:
+        p, is_file = _resolve_and_stat(path)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Executable not found: {e.filename}") from None
+    if not is_file:
         raise FileNotFoundError(f"Path is not a file: {p}")
     if p.suffix.lower() != ".exe":
         log.warning("Path does not end with .exe — may not be a valid executable: %s", p)
@@ -60,11 +86,11 @@ def validate_icon_path(path: str | None) -> str | None:
 
     # Strip optional icon index suffix (e.g. ",0")
     raw = path.split(",")[0].strip()
-    p = Path(raw).resolve()
-
-    if not p.exists():
-        raise FileNotFoundError(f"Icon source not found: {p}")
-    if not p.is_file():
+    try:
+        p, is_file = _resolve_and_stat(raw)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Icon source not found: {e.filename}") from None
+    if not is_file:
         raise FileNotFoundError(f"Icon path is not a file: {p}")
 
     log.debug("Validated icon: %s", path)
@@ -2,6 +2,7 @@
 Lightweight HTTP API server — bridges the Web UI to RegistryManager.
 
 Endpoints:
+    GET  /api/ready            → 200 once the registry layer is up, else 503
     GET  /api/entries          → list all entries from all scopes
     GET  /api/entry/<key>      → read details for a specific key
     POST /api/entries          → add a new entry
@@ -13,20 +14,33 @@ Endpoints:
 
 from __future__ import annotations
 
+import ctypes
 import json
 import os
+import re
 import sys
 import threading
+import time
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from ctypes import wintypes
 from datetime import datetime
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Mapping
 from urllib.parse import urlparse, unquote
 
+try:
+    import orjson  # optional — ~5× faster JSON, emits UTF-8 bytes directly
+except ImportError:
+    orjson = None
+
 from app.config import MenuEntry, TargetScope
 from app.registry_manager import RegistryManager
 from app.safety import is_admin
-from app.logger_setup import get_logger
+from app.logger_setup import get_logger, released_log_file
 
 log = get_logger("server")
 
@@ -42,6 +56,7 @@ _APP_DIR = Path(os.environ.get("TEMP", r"C:\temp")) / "ContextMenuCreator"
 _STATIC_DIR = _BASE_DIR / "static"
 _LOG_FILE = _APP_DIR / "logs" / "context_menu.log"
 _LOG_BACKUP_DIR = _APP_DIR / "logs" / "backups"
+_LOG_BACKUP_DIR_RESOLVED = _LOG_BACKUP_DIR.resolve()
 _PORT = 8787
 
 # Scope string ↔ enum mapping
@@ -54,6 +69,12 @@ _SCOPE_FROM_STR: dict[str, TargetScope] = {
 
 _SCOPE_TO_STR: dict[TargetScope, str] = {v: k for k, v in _SCOPE_FROM_STR.items()}
 
+# The fixed-root scopes the API enumerates, in display order
+_ALL_SCOPES: tuple[TargetScope, ...] = (
+    TargetScope.ALL_FILES, TargetScope.DIRECTORY, TargetScope.DIR_BACKGROUND,
+)
+_ALL_SCOPES_STR: tuple[str, ...] = tuple(_SCOPE_TO_STR[s] for s in _ALL_SCOPES)
+
 _SCOPE_LABELS: dict[TargetScope, str] = {
     TargetScope.ALL_FILES:      "All Files (*)",
     TargetScope.DIRECTORY:      "Directory",
@@ -61,10 +82,281 @@ _SCOPE_LABELS: dict[TargetScope, str] = {
 }
 
 
+# ── /api/entries response cache ─────────────────────────────────
+# Stores the already-serialized payload so a hit skips both the
+# registry walk and JSON encoding.  Any mutation invalidates it.
+_ENTRIES_CACHE_TTL = 5.0  # seconds
+_entries_cache: tuple[bytes, float] | None = None  # (payload, monotonic ts)
+_entries_generation = 0  # bumped on every invalidation
+_entries_cache_lock = threading.Lock()
+
+# Reads run in parallel; registry writes are serialized
+_registry_lock = threading.Lock()
+
+
+def _invalidate_entries_cache() -> None:
+    global _entries_cache, _entries_generation
+    with _entries_cache_lock:
+        _entries_cache = None
+        _entries_generation += 1
+
+
+@contextmanager
+def _registry_mutation():
+    """Serialize a registry write and drop the cached entry list afterwards."""
+    with _registry_lock:
+        try:
+            yield
+        finally:
+            _invalidate_entries_cache()
+
+
+# ── Log tail helpers ────────────────────────────────────────────
+_LOG_TAIL_BYTES = 64 * 1024
+# path → ((mtime_ns, size), line count); backups never change, so they're counted once
+_line_counts: dict[str, tuple[tuple[int, int], int]] = {}
+
+
+def _tail_lines(path: Path, n: int) -> list[str]:
+    """Return the last `n` lines of `path`, reading at most the final 64 KB."""
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        start = max(0, size - _LOG_TAIL_BYTES)
+        f.seek(start)
+        data = f.read()
+    # Only a single line longer than the window can come back truncated
+    return data.decode("utf-8", errors="replace").splitlines()[-n:]
+
+
+def _count_lines(path: str | Path, st: os.stat_result) -> int:
+    """Count lines without decoding; cached per path until its mtime/size change."""
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _line_counts.get(str(path))
+    if cached and cached[0] == key:
+        return cached[1]
+
+    count = 0
+    last = b""
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            count += chunk.count(b"\n")
+            last = chunk
+    if last and not last.endswith(b"\n"):
+        count += 1  # unterminated final line
+    _line_counts[str(path)] = (key, count)
+    return count
+
+
+# Backup names are flat "<name>.bak" files — no separators, no traversal
+_SAFE_BACKUP_NAME = re.compile(r"[\w.\-]+\.bak")
+
+
+def _backup_path(filename) -> Path | None:
+    """Resolve a client-supplied backup name, or None if unsafe or missing."""
+    if not isinstance(filename, str) or not _SAFE_BACKUP_NAME.fullmatch(filename):
+        return None
+    path = (_LOG_BACKUP_DIR_RESOLVED / filename).resolve()
+    if path.parent != _LOG_BACKUP_DIR_RESOLVED or not path.is_file():
+        return None
+    return path
+
+
+def _format_local_time(ts: float) -> str:
+    """Format a timestamp as local "YYYY-MM-DD HH:MM:SS" without strftime."""
+    t = time.localtime(ts)
+    return (
+        f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} "
+        f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+    )
+
+
+def _iter_backups() -> list[os.DirEntry]:
+    """
+    List backup files in one directory read.
+    DirEntry.stat() is served from the scan itself on Windows — no extra syscall.
+    """
+    try:
+        # Resolved dir, so DirEntry.path matches `_backup_path` (and the
+        # `_line_counts` keys it evicts)
+        with os.scandir(_LOG_BACKUP_DIR_RESOLVED) as it:
+            return [e for e in it if e.name.endswith(".bak") and e.is_file()]
+    except FileNotFoundError:
+        return []
+
+
+# ── Native file picker (comdlg32) ──────────────────────────────
+# GetOpenFileNameW shows the system dialog directly — no Tcl/Tk
+# interpreter spun up and torn down for every pick.
+
+class _OPENFILENAMEW(ctypes.Structure):
+    _fields_ = [
+        ("lStructSize", wintypes.DWORD),
+        ("hwndOwner", wintypes.HWND),
+        ("hInstance", wintypes.HINSTANCE),
+        ("lpstrFilter", wintypes.LPCWSTR),
+        ("lpstrCustomFilter", wintypes.LPWSTR),
+        ("nMaxCustFilter", wintypes.DWORD),
+        ("nFilterIndex", wintypes.DWORD),
+        ("lpstrFile", wintypes.LPWSTR),
+        ("nMaxFile", wintypes.DWORD),
+        ("lpstrFileTitle", wintypes.LPWSTR),
+        ("nMaxFileTitle", wintypes.DWORD),
+        ("lpstrInitialDir", wintypes.LPCWSTR),
+        ("lpstrTitle", wintypes.LPCWSTR),
+        ("Flags", wintypes.DWORD),
+        ("nFileOffset", wintypes.WORD),
+        ("nFileExtension", wintypes.WORD),
+        ("lpstrDefExt", wintypes.LPCWSTR),
+        ("lCustData", wintypes.LPARAM),
+        ("lpfnHook", wintypes.LPVOID),
+        ("lpTemplateName", wintypes.LPCWSTR),
+        ("pvReserved", wintypes.LPVOID),
+        ("dwReserved", wintypes.DWORD),
+        ("FlagsEx", wintypes.DWORD),
+    ]
+
+
+_OFN_NOCHANGEDIR = 0x00000008
+_OFN_PATHMUSTEXIST = 0x00000800
+_OFN_FILEMUSTEXIST = 0x00001000
+_OFN_EXPLORER = 0x00080000
+
+
+_comdlg32 = ctypes.WinDLL("comdlg32")
+_user32 = ctypes.WinDLL("user32")
+_ole32 = ctypes.WinDLL("ole32")
+
+_comdlg32.GetOpenFileNameW.argtypes = [ctypes.POINTER(_OPENFILENAMEW)]
+_comdlg32.GetOpenFileNameW.restype = wintypes.BOOL
+_user32.FindWindowW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR]
+_user32.FindWindowW.restype = wintypes.HWND
+_ole32.CoInitialize.argtypes = [wintypes.LPVOID]
+_ole32.CoInitialize.restype = ctypes.c_long  # HRESULT, checked by hand
+_ole32.CoUninitialize.argtypes = []
+_ole32.CoUninitialize.restype = None
+
+
+def _open_exe_dialog() -> str | None:
+    """Show the native "open file" dialog for an .exe; None if cancelled."""
+    # Pairs of (label, pattern), NUL-separated, double-NUL terminated
+    filters = ctypes.create_unicode_buffer("Executables\0*.exe\0All Files\0*.*\0\0")
+    file_buf = ctypes.create_unicode_buffer(32768)
+
+    ofn = _OPENFILENAMEW()
+    ofn.lStructSize = ctypes.sizeof(ofn)
+    # Parent to the app window (if any) so the dialog stays on top of it
+    ofn.hwndOwner = _user32.FindWindowW(None, "Context Menu Creator")
+    ofn.lpstrFilter = ctypes.cast(filters, wintypes.LPCWSTR)
+    ofn.nFilterIndex = 1
+    ofn.lpstrFile = ctypes.cast(file_buf, wintypes.LPWSTR)
+    ofn.nMaxFile = len(file_buf)
+    ofn.lpstrTitle = "Select Application (.exe)"
+    ofn.Flags = _OFN_EXPLORER | _OFN_FILEMUSTEXIST | _OFN_PATHMUSTEXIST | _OFN_NOCHANGEDIR
+
+    # The Explorer-style dialog needs COM on this thread; only balance a
+    # successful init (S_OK/S_FALSE), not e.g. RPC_E_CHANGED_MODE
+    hr = _ole32.CoInitialize(None)
+    try:
+        if _comdlg32.GetOpenFileNameW(ctypes.byref(ofn)):
+            return file_buf.value or None
+        return None
+    finally:
+        if hr >= 0:
+            _ole32.CoUninitialize()
+
+
+def _json_dumps(data) -> bytes:
+    """Serialize to UTF-8 JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(raw: bytes):
+    """Parse JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# Pre-encoded bodies for the fixed-shape responses that dominate
+# acks and status polls — keyed by the dict's items in order.
+_JSON_CACHE: dict[tuple, bytes] = {
+    tuple(d.items()): _json_dumps(d)
+    for d in (
+        {"success": True},
+        {"error": "Not found"},
+        {"error": "Backup not found"},
+        {"error": "No filename specified"},
+        *({"admin": a, "classic_menu": c} for a in (True, False) for c in (True, False)),
+        *({"success": True, "classic_menu": c} for c in (True, False)),
+    )
+}
+
+
+# Shared read-only stand-in for an absent request body
+_EMPTY_BODY: Mapping = MappingProxyType({})
+
+# Request bodies are small JSON objects; anything larger is refused
+# before it is read or parsed
+_MAX_BODY_BYTES = 65536
+
+# ── Routes ─────────────────────────────────────────────────────
+# method → [(compiled path pattern, handler method name, wants_body)]
+# Named groups are passed to the handler as keyword arguments.
+_ROUTES: dict[str, list[tuple[re.Pattern, str, bool]]] = {
+    "GET": [
+        (re.compile(r"/api/ready"), "_handle_ready", False),
+        (re.compile(r"/api/entries"), "_handle_list_entries", False),
+        (re.compile(r"/api/entry/(?P<key_name>.+)"), "_handle_get_entry", False),
+        (re.compile(r"/api/status"), "_handle_status", False),
+        (re.compile(r"/api/logs"), "_handle_get_logs", False),
+        (re.compile(r"/api/logs/backups"), "_handle_list_backups", False),
+        (re.compile(r"/api/open-log-folder"), "_handle_open_log_folder", False),
+    ],
+    "POST": [
+        (re.compile(r"/api/entries"), "_handle_add_entry", True),
+        (re.compile(r"/api/pick-file"), "_handle_pick_file", False),
+        (re.compile(r"/api/win11-menu"), "_handle_toggle_win11", True),
+        (re.compile(r"/api/logs/clear"), "_handle_clear_logs", False),
+        (re.compile(r"/api/logs/restore"), "_handle_restore_logs", True),
+    ],
+    "DELETE": [
+        (re.compile(r"/api/entries/(?P<key_name>.+)"), "_handle_remove_entry", False),
+        (re.compile(r"/api/logs/backups/(?P<filename>.+)"), "_handle_delete_backup", False),
+    ],
+    "PUT": [
+        (re.compile(r"/api/entries/(?P<key_name>.+)"), "_handle_edit_entry", True),
+    ],
+}
+
+
 class APIHandler(SimpleHTTPRequestHandler):
     """Handle both static file serving and /api/* routes."""
 
-    manager: RegistryManager  # set at class level before serving
+    # Buffer the response stream so headers and a typical JSON body leave
+    # in one send; handle_one_request()/finish() flush after each request
+    wbufsize = 64 * 1024
+
+    # Built lazily on first use (see `get_manager`) so the port can open
+    # before the registry layer is ready
+    _manager: RegistryManager | None = None
+    _manager_lock = threading.Lock()
+
+    @classmethod
+    def get_manager(cls) -> RegistryManager:
+        """Return the shared RegistryManager, constructing it on first call."""
+        manager = cls._manager
+        if manager is None:
+            with cls._manager_lock:
+                manager = cls._manager
+                if manager is None:
+                    manager = cls._manager = RegistryManager(dry_run=False)
+        return manager
+
+    @property
+    def manager(self) -> RegistryManager:
+        return self.get_manager()
 
     def __init__(self, *args, **kwargs):
         # Serve files from the static directory
@@ -77,111 +369,98 @@ class APIHandler(SimpleHTTPRequestHandler):
     # ── Routing ─────────────────────────────────────────────────
 
     def do_GET(self):
-        parsed = urlparse(self.path)
-        path = unquote(parsed.path)
-
-        if path == "/api/entries":
-            self._handle_list_entries()
-        elif path.startswith("/api/entry/"):
-            key_name = path.split("/api/entry/", 1)[1]
-            self._handle_get_entry(key_name)
-        elif path == "/api/status":
-            self._json_response({
-                "admin": is_admin(),
-                "classic_menu": self.manager.is_classic_menu_forced(),
-            })
-        elif path == "/api/logs":
-            self._handle_get_logs()
-        elif path == "/api/logs/backups":
-            self._handle_list_backups()
-        elif path == "/api/open-log-folder":
-            log_dir = str(_APP_DIR / "logs")
-            os.makedirs(log_dir, exist_ok=True)
-            os.startfile(log_dir)
-            self._json_response({"ok": True, "path": log_dir})
-        else:
+        if not self._dispatch("GET"):
             super().do_GET()
 
     def do_POST(self):
-        parsed = urlparse(self.path)
-        path = unquote(parsed.path)
-        body = self._read_body()
-
-        if path == "/api/entries":
-            self._handle_add_entry(body)
-        elif path == "/api/pick-file":
-            self._handle_pick_file()
-        elif path == "/api/win11-menu":
-            self._handle_toggle_win11(body)
-        elif path == "/api/logs/clear":
-            self._handle_clear_logs()
-        elif path == "/api/logs/restore":
-            self._handle_restore_logs(body)
-        else:
+        if not self._dispatch("POST"):
             self._json_response({"error": "Not found"}, 404)
 
     def do_DELETE(self):
-        parsed = urlparse(self.path)
-        path = unquote(parsed.path)
-
-        if path.startswith("/api/entries/"):
-            key_name = path.split("/api/entries/", 1)[1]
-            self._handle_remove_entry(key_name)
-        elif path.startswith("/api/logs/backups/"):
-            filename = path.split("/api/logs/backups/", 1)[1]
-            self._handle_delete_backup(filename)
-        else:
+        if not self._dispatch("DELETE"):
             self._json_response({"error": "Not found"}, 404)
 
     def do_PUT(self):
-        parsed = urlparse(self.path)
-        path = unquote(parsed.path)
-        body = self._read_body()
-
-        if path.startswith("/api/entries/"):
-            key_name = path.split("/api/entries/", 1)[1]
-            self._handle_edit_entry(key_name, body)
-        else:
+        if not self._dispatch("PUT"):
             self._json_response({"error": "Not found"}, 404)
 
+    def _dispatch(self, method: str) -> bool:
+        """Route the request via `_ROUTES`. Returns False if nothing matched."""
+        path = unquote(urlparse(self.path).path)
+
+        for pattern, handler, wants_body in _ROUTES[method]:
+            match = pattern.fullmatch(path)
+            if match:
+                kwargs = match.groupdict()
+                if wants_body:
+                    # Only routes that use a body pay for reading + parsing it
+                    body = self._read_body()
+                    if body is None:  # rejected — response already sent
+                        return True
+                    kwargs["body"] = body
+                getattr(self, handler)(**kwargs)
+                return True
+        return False
+
     # ── API Handlers ────────────────────────────────────────────
 
+    def _handle_ready(self):
+        """503 until the RegistryManager exists — lets the UI show a spinner."""
+        if self._manager is None:
+            self._json_response({"ready": False}, 503)
+        else:
+            self._json_response({"ready": True})
+
+    def _handle_status(self):
+        """Report admin rights and the Win11 menu mode."""
+        self._json_response({
+            "admin": is_admin(),
+            "classic_menu": self.manager.is_classic_menu_forced(),
+        })
+
+    def _handle_open_log_folder(self):
+        """Open the log directory in Explorer."""
+        log_dir = str(_APP_DIR / "logs")
+        os.makedirs(log_dir, exist_ok=True)
+        os.startfile(log_dir)
+        self._json_response({"ok": True, "path": log_dir})
+
     def _handle_list_entries(self):
         """Return all entries grouped by scope with details."""
-        result: list[dict] = []
-        seen: set[str] = set()
-
-        for scope in (TargetScope.ALL_FILES, TargetScope.DIRECTORY, TargetScope.DIR_BACKGROUND):
-            entries = self.manager.list_entries(scope)
-            for key_name in entries:
-                if key_name not in seen:
-                    seen.add(key_name)
-                    # Gather all scopes this key exists in
-                    scopes = []
-                    for s in (TargetScope.ALL_FILES, TargetScope.DIRECTORY, TargetScope.DIR_BACKGROUND):
-                        if key_name in self.manager.list_entries(s):
-                            scopes.append(_SCOPE_TO_STR[s])
-
-                    details = self.manager.read_entry_details(scope, key_name)
-                    result.append({
-                        "key_name": key_name,
-                        "display_name": details["display_name"] if details else key_name,
-                        "icon": details.get("icon") if details else None,
-                        "command": details.get("command") if details else None,
-                        "scopes": scopes,
-                    })
-
-        self._json_response(result)
+        global _entries_cache
+        with _entries_cache_lock:
+            cached = _entries_cache
+            generation = _entries_generation
+        if cached and time.monotonic() - cached[1] < _ENTRIES_CACHE_TTL:
+            self._send_json_bytes(cached[0])
+            return
+
+        result = [
+            {
+                "key_name": key_name,
+                "display_name": key_name if info["display_name"] is None else info["display_name"],
+                "icon": info["icon"],
+                "command": info["command"],
+                "scopes": [_SCOPE_TO_STR[s] for s in info["scopes"]],
+            }
+            for key_name, info in self.manager.read_all_entries(_ALL_SCOPES).items()
+        ]
+
+        body = _json_dumps(result)
+        with _entries_cache_lock:
+            # Don't store a result that a concurrent write already outdated
+            if generation == _entries_generation:
+                _entries_cache = (body, time.monotonic())
+        self._send_json_bytes(body)
 
     def _handle_get_entry(self, key_name: str):
         """Return details for a specific entry."""
-        for scope in (TargetScope.ALL_FILES, TargetScope.DIRECTORY, TargetScope.DIR_BACKGROUND):
+        scope_sets = None
+        for scope in _ALL_SCOPES:
             details = self.manager.read_entry_details(scope, key_name)
             if details:
-                scopes = []
-                for s in (TargetScope.ALL_FILES, TargetScope.DIRECTORY, TargetScope.DIR_BACKGROUND):
-                    if key_name in self.manager.list_entries(s):
-                        scopes.append(_SCOPE_TO_STR[s])
+                scope_sets = scope_sets or self._scope_sets()
+                scopes = [n for n, keys in zip(_ALL_SCOPES_STR, scope_sets.values()) if key_name in keys]
 
                 details["key_name"] = key_name
                 details["scopes"] = scopes
@@ -203,7 +482,8 @@ class APIHandler(SimpleHTTPRequestHandler):
                 extensions=body.get("extensions", []),
                 command_template=body.get("command_template", '"{exe_path}" "{target}"'),
             )
-            self.manager.add_entry(entry)
+            with _registry_mutation():
+                self.manager.add_entry(entry)
             self._json_response({"success": True, "key_name": entry.key_name})
         except Exception as e:
             self._json_response({"error": str(e)}, 400)
@@ -211,10 +491,7 @@ class APIHandler(SimpleHTTPRequestHandler):
     def _handle_remove_entry(self, key_name: str):
         """Remove an entry from all its scopes."""
         try:
-            scopes = []
-            for s in (TargetScope.ALL_FILES, TargetScope.DIRECTORY, TargetScope.DIR_BACKGROUND):
-                if key_name in self.manager.list_entries(s):
-                    scopes.append(s)
+            scopes = [s for s, keys in self._scope_sets().items() if key_name in keys]
 
             if not scopes:
                 self._json_response({"error": "Not found"}, 404)
@@ -226,7 +503,8 @@ class APIHandler(SimpleHTTPRequestHandler):
                 exe_path="C:\\dummy.exe",
                 scopes=scopes,
             )
-            self.manager.remove_entry(entry)
+            with _registry_mutation():
+                self.manager.remove_entry(entry)
             self._json_response({"success": True})
         except Exception as e:
             self._json_response({"error": str(e)}, 400)
@@ -234,36 +512,32 @@ class APIHandler(SimpleHTTPRequestHandler):
     def _handle_edit_entry(self, key_name: str, body: dict):
         """Edit an entry: remove old scopes, re-add with new ones."""
         try:
-            # Find current scopes
-            current_scopes = []
-            details = None
-            for s in (TargetScope.ALL_FILES, TargetScope.DIRECTORY, TargetScope.DIR_BACKGROUND):
-                if key_name in self.manager.list_entries(s):
-                    current_scopes.append(s)
-                    if details is None:
-                        details = self.manager.read_entry_details(s, key_name)
-
-            if not current_scopes or not details:
+            # Find current scopes; details come from the first one only
+            scope_sets = self._scope_sets()
+            current_scopes = [s for s in _ALL_SCOPES if key_name in scope_sets[s]]
+            details = (
+                self.manager.read_entry_details(current_scopes[0], key_name)
+                if current_scopes else None
+            )
+
+            if not details:
                 self._json_response({"error": "Not found"}, 404)
                 return
 
             # Extract exe_path from command
-            cmd = details.get("command", "")
+            cmd = details.get("command") or ""
             if cmd.startswith('"'):
-                exe_path = cmd.split('"')[1]
+                end = cmd.find('"', 1)
+                exe_path = cmd[1:end] if end != -1 else cmd[1:]
             else:
-                exe_path = cmd.split()[0] if cmd else ""
+                exe_path = cmd.split(None, 1)[0] if cmd else ""
 
-            # Remove from old scopes
             old_entry = MenuEntry(
                 key_name=key_name,
                 display_name=details["display_name"],
                 exe_path=exe_path or "C:\\dummy.exe",
                 scopes=current_scopes,
             )
-            self.manager.remove_entry(old_entry)
-
-            # Re-add with new scopes
             new_scopes = [_SCOPE_FROM_STR[s] for s in body.get("scopes", [])]
             new_entry = MenuEntry(
                 key_name=key_name,
@@ -273,49 +547,34 @@ class APIHandler(SimpleHTTPRequestHandler):
                 scopes=new_scopes,
                 extensions=body.get("extensions", []),
             )
-            self.manager.add_entry(new_entry)
+
+            with _registry_mutation():
+                # Remove from old scopes, then re-add with new ones
+                self.manager.remove_entry(old_entry)
+                self.manager.add_entry(new_entry)
             self._json_response({"success": True})
         except Exception as e:
             self._json_response({"error": str(e)}, 400)
 
     def _handle_pick_file(self):
-        """Open native file dialog in a separate thread to avoid blocking."""
-        import tkinter as tk
-        from tkinter import filedialog
-
-        result = {"path": None}
-
-        def pick():
-            root = tk.Tk()
-            root.withdraw()
-            root.attributes("-topmost", True)
-            path = filedialog.askopenfilename(
-                title="Select Application (.exe)",
-                filetypes=[("Executables", "*.exe"), ("All Files", "*.*")],
-            )
-            root.destroy()
-            result["path"] = path or None
-
-        t = threading.Thread(target=pick)
-        t.start()
-        t.join(timeout=120)
-
-        self._json_response(result)
+        """Open the native file dialog (blocks only this worker thread)."""
+        self._json_response({"path": _open_exe_dialog()})
 
     def _handle_toggle_win11(self, body: dict):
         """Toggle Windows 11 classic/modern context menu."""
         try:
             action = body.get("action", "toggle")
-            if action == "enable":
-                self.manager.force_classic_menu()
-            elif action == "disable":
-                self.manager.restore_modern_menu()
-            else:
-                # toggle
-                if self.manager.is_classic_menu_forced():
+            with _registry_mutation():
+                if action == "enable":
+                    self.manager.force_classic_menu()
+                elif action == "disable":
                     self.manager.restore_modern_menu()
                 else:
-                    self.manager.force_classic_menu()
+                    # toggle
+                    if self.manager.is_classic_menu_forced():
+                        self.manager.restore_modern_menu()
+                    else:
+                        self.manager.force_classic_menu()
 
             restart = body.get("restart_explorer", False)
             if restart:
@@ -333,14 +592,16 @@ class APIHandler(SimpleHTTPRequestHandler):
     def _handle_get_logs(self):
         """Return the last N lines of the log file."""
         try:
-            if _LOG_FILE.exists():
-                lines = _LOG_FILE.read_text(encoding="utf-8", errors="replace").splitlines()
-            else:
-                lines = []
-            backup_count = len(list(_LOG_BACKUP_DIR.glob("*.bak"))) if _LOG_BACKUP_DIR.exists() else 0
+            try:
+                st = _LOG_FILE.stat()
+                lines = _tail_lines(_LOG_FILE, 10)
+                total = _count_lines(_LOG_FILE, st)
+            except FileNotFoundError:
+                lines, total = [], 0
+            backup_count = len(_iter_backups())
             self._json_response({
-                "lines": lines[-10:],
-                "total": len(lines),
+                "lines": lines,
+                "total": total,
                 "backup_count": backup_count,
             })
         except Exception as e:
@@ -350,29 +611,30 @@ class APIHandler(SimpleHTTPRequestHandler):
         """Return all backup files sorted newest first."""
         try:
             backups = []
-            if _LOG_BACKUP_DIR.exists():
-                for f in sorted(_LOG_BACKUP_DIR.glob("*.bak"), reverse=True):
-                    stat = f.stat()
-                    backups.append({
-                        "filename": f.name,
-                        "size": stat.st_size,
-                        "created": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
-                        "lines": len(f.read_text(encoding="utf-8", errors="replace").splitlines()),
-                    })
+            # Names embed the backup timestamp, so name order is newest first
+            for entry in sorted(_iter_backups(), key=lambda e: e.name, reverse=True):
+                stat = entry.stat()
+                backups.append({
+                    "filename": entry.name,
+                    "size": stat.st_size,
+                    "created": _format_local_time(stat.st_mtime),
+                    "lines": _count_lines(entry.path, stat),
+                })
             self._json_response(backups)
         except Exception as e:
             self._json_response({"error": str(e)}, 400)
 
     def _handle_clear_logs(self):
-        """Backup current log with timestamp, then truncate it."""
-        import shutil
+        """Move the current log into a timestamped backup and start a fresh one."""
         try:
             if _LOG_FILE.exists() and _LOG_FILE.stat().st_size > 0:
                 _LOG_BACKUP_DIR.mkdir(parents=True, exist_ok=True)
                 ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
                 backup_path = _LOG_BACKUP_DIR / f"context_menu_{ts}.log.bak"
-                shutil.copy2(_LOG_FILE, backup_path)
-                _LOG_FILE.write_text("", encoding="utf-8")
+                # A rename moves no data, unlike copy + truncate
+                with released_log_file():
+                    os.replace(_LOG_FILE, backup_path)
+                    open(_LOG_FILE, "wb").close()
             self._json_response({"success": True})
         except Exception as e:
             self._json_response({"error": str(e)}, 400)
@@ -384,14 +646,15 @@ class APIHandler(SimpleHTTPRequestHandler):
             if not filename:
                 self._json_response({"error": "No filename specified"}, 400)
                 return
-            backup_path = _LOG_BACKUP_DIR / filename
-            if not backup_path.exists() or not str(backup_path).startswith(str(_LOG_BACKUP_DIR)):
+            backup_path = _backup_path(filename)
+            if backup_path is None:
                 self._json_response({"error": "Backup not found"}, 404)
                 return
             backup_content = backup_path.read_text(encoding="utf-8", errors="replace")
             with open(_LOG_FILE, "a", encoding="utf-8") as f:
                 f.write(backup_content)
             backup_path.unlink()
+            _line_counts.pop(str(backup_path), None)
             self._json_response({"success": True})
         except Exception as e:
             self._json_response({"error": str(e)}, 400)
@@ -399,24 +662,74 @@ class APIHandler(SimpleHTTPRequestHandler):
     def _handle_delete_backup(self, filename: str):
         """Permanently delete a specific backup file."""
         try:
-            backup_path = _LOG_BACKUP_DIR / filename
-            if not backup_path.exists() or not str(backup_path).startswith(str(_LOG_BACKUP_DIR)):
+            backup_path = _backup_path(filename)
+            if backup_path is None:
                 self._json_response({"error": "Backup not found"}, 404)
                 return
             backup_path.unlink()
+            _line_counts.pop(str(backup_path), None)
             self._json_response({"success": True})
         except Exception as e:
             self._json_response({"error": str(e)}, 400)
 
     # ── Utilities ───────────────────────────────────────────────
 
-    def _read_body(self) -> dict:
-        length = int(self.headers.get("Content-Length", 0))
-        raw = self.rfile.read(length)
-        return json.loads(raw) if raw else {}
+    def _list_scope_entries(self) -> dict[TargetScope, list[str]]:
+        """Enumerate each scope's registry keys exactly once per request."""
+        return {
+            s: self.manager.list_entries(s)
+            for s in _ALL_SCOPES
+        }
+
+    def _scope_sets(self) -> dict[TargetScope, set[str]]:
+        """Like `_list_scope_entries`, but as sets for O(1) membership tests."""
+        return {s: set(keys) for s, keys in self._list_scope_entries().items()}
+
+    def _read_body(self) -> Mapping | None:
+        """
+        Parse the JSON object body, bounded by `_MAX_BODY_BYTES`.
+        On a bad request the error response is sent here and None returned.
+        """
+        length = self.headers.get("Content-Length")
+        if not length or length == "0":
+            return _EMPTY_BODY
+        try:
+            size = int(length)
+        except ValueError:
+            size = -1
+        if size < 0 or size > _MAX_BODY_BYTES:
+            # Never read (or allocate for) a body we're going to refuse;
+            # the unread bytes make the connection unusable, so drop it
+            self.close_connection = True
+            if size < 0:
+                self._json_response({"error": "Invalid Content-Length"}, 400)
+            else:
+                self._json_response({"error": "Request body too large"}, 413)
+            return None
+
+        raw = self.rfile.read(size)
+        if not raw:
+            return _EMPTY_BODY
+        try:
+            body = _json_loads(raw)
+        except ValueError:  # JSONDecodeError (json/orjson), bad UTF-8
+            body = None
+        if not isinstance(body, dict):
+            # Don't echo parser details back to the client
+            self._json_response({"error": "Invalid JSON body"}, 400)
+            return None
+        return body
 
     def _json_response(self, data, status: int = 200):
-        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        body = None
+        if type(data) is dict and len(data) <= 2:
+            try:
+                body = _JSON_CACHE.get(tuple(data.items()))
+            except TypeError:  # unhashable values — not a cached shape
+                pass
+        self._send_json_bytes(body or _json_dumps(data), status)
+
+    def _send_json_bytes(self, body: bytes, status: int = 200):
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Content-Length", str(len(body)))
@@ -426,23 +739,59 @@ class APIHandler(SimpleHTTPRequestHandler):
 
 # ── Server launchers ───────────────────────────────────────────
 
-_server_instance: HTTPServer | None = None
+class _PooledHTTPServer(ThreadingHTTPServer):
+    """
+    ThreadingHTTPServer that hands requests to a bounded worker pool,
+    so a slow request (e.g. the file picker) no longer blocks the UI
+    and bursts can't spawn unbounded threads.
+
+    Pool workers are ordinary (non-daemon) threads: `server_close` drops
+    queued requests, but the interpreter still joins in-flight ones at
+    exit, so in --browser mode an open file dialog delays shutdown until
+    it is dismissed.  The desktop GUI ends with os._exit and never waits.
+    """
+
+    max_workers = 16
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="api",
+        )
 
+    def process_request(self, request, client_address):
+        self._pool.submit(self.process_request_thread, request, client_address)
 
-def start_server() -> None:
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_server_instance: _PooledHTTPServer | None = None
+
+
+def start_server(ready_callback: Callable[[], None] | None = None) -> None:
     """Start the HTTP server (headless — no browser, no webview).
 
     Used by gui.py to run the API in a background thread.
     Blocks until server_close() is called or the process exits.
+
+    ``ready_callback`` is invoked once the socket is bound and listening,
+    so callers can wait on it instead of polling the URL.
     """
     global _server_instance
-    APIHandler.manager = RegistryManager(dry_run=False)
+    # Warm the manager off-thread; the first request builds it if this loses
+    threading.Thread(target=APIHandler.get_manager, name="manager-init", daemon=True).start()
 
-    _server_instance = HTTPServer(("127.0.0.1", _PORT), APIHandler)
+    # The server binds + listens in its constructor
+    _server_instance = _PooledHTTPServer(("127.0.0.1", _PORT), APIHandler)
     url = f"http://127.0.0.1:{_PORT}"
     log.info("Server running at %s", url)
     print(f"\n  [OK] Server listening on {url}")
 
+    if ready_callback is not None:
+        ready_callback()
+
     _server_instance.serve_forever()
 
 
@@ -461,9 +810,9 @@ def start_gui() -> None:
         print("  ⚠  Not running as Administrator — add/remove/edit will fail.")
         print("     Right-click your terminal → 'Run as administrator'.\n")
 
-    APIHandler.manager = RegistryManager(dry_run=False)
+    threading.Thread(target=APIHandler.get_manager, name="manager-init", daemon=True).start()
 
-    server = HTTPServer(("127.0.0.1", _PORT), APIHandler)
+    server = _PooledHTTPServer(("127.0.0.1", _PORT), APIHandler)
     url = f"http://127.0.0.1:{_PORT}"
     log.info("Server running at %s", url)
     print(f"\n  ✔ GUI running at {url}")
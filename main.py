@@ -6,11 +6,22 @@ Usage (run as Administrator):
     python main.py remove   — Unregister entries
     python main.py list     — Show existing shell entries
     python main.py dry-add  — Simulate registration (no writes)
+    python main.py apply entries.json
+                            — Register every entry in a JSON list, no prompts
 """
 
 from __future__ import annotations
 
+import atexit
+import functools
+import itertools
+import json
+import queue
+import re
 import sys
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, NoReturn
 
 from app.config import MenuEntry, TargetScope
 from app.registry_manager import RegistryManager
@@ -19,54 +30,218 @@ from app.logger_setup import get_logger
 
 log = get_logger("main")
 
+# Menu digit → scope, shared by the add and edit prompts
+_SCOPE_MAP: dict[str, TargetScope] = {
+    "1": TargetScope.ALL_FILES,
+    "2": TargetScope.DIRECTORY,
+    "3": TargetScope.DIR_BACKGROUND,
+    "4": TargetScope.EXTENSION,
+}
+
+# Fixed-root scopes, in display order, with their long and short labels
+_SCOPE_LABELS: dict[TargetScope, str] = {
+    TargetScope.ALL_FILES:      "All Files (*)",
+    TargetScope.DIRECTORY:      "Directory",
+    TargetScope.DIR_BACKGROUND: r"Directory\Background",
+}
+
+_SCOPE_LABELS_SHORT: dict[TargetScope, str] = {
+    TargetScope.ALL_FILES:      "*",
+    TargetScope.DIRECTORY:      "Dir",
+    TargetScope.DIR_BACKGROUND: "DirBG",
+}
+
+_LISTED_SCOPES: tuple[TargetScope, ...] = tuple(_SCOPE_LABELS)
+
+# Executable at the start of a command: "quoted path" (closing quote
+# optional) or the first bare token
+_EXE_RE = re.compile(r'\s*(?:"([^"]*)|(\S+))')
+
+# ── Banners (built once at import) ──────────────────────────────
+_BANNER_WIDTH = 42
+_BANNER_TOP = "╔" + "═" * _BANNER_WIDTH + "╗"
+_BANNER_BOT = "╚" + "═" * _BANNER_WIDTH + "╝"
+
+
+def _banner(title: str) -> str:
+    """Three-line box with `title` centred inside."""
+    return f"{_BANNER_TOP}\n║{title:^{_BANNER_WIDTH}}║\n{_BANNER_BOT}"
+
+
+_BANNER_MAIN = _banner("Windows Context Menu Creator  v1.0")
+_BANNER_SETUP = _banner("Windows Context Menu Creator — Setup")
+_BANNER_REMOVE = _banner("Existing Context Menu Entries")
+_BANNER_EDIT = _banner("Select Entry to Edit")
+
+# Options that write under HKCR; "5" only touches HKCU and needs no elevation
+_ADMIN_CHOICES = frozenset("124")
+
+
+def _parse_scopes(raw: str) -> list[TargetScope]:
+    """Parse a comma-separated scope selection like "1,2"; ValueError if invalid."""
+    tokens = [t.strip() for t in raw.split(",") if t.strip()]
+    if not tokens:
+        raise ValueError("No scopes selected.")
+    bad = [t for t in tokens if t not in _SCOPE_MAP]
+    if bad:
+        raise ValueError(f"Unknown scope(s): {', '.join(bad)}")
+    return list(dict.fromkeys(_SCOPE_MAP[t] for t in tokens))
+
+
+def _parse_extensions(raw: str) -> list[str]:
+    """Parse a comma-separated extension list like ".py,.js"; ValueError if empty."""
+    extensions = [e.strip() for e in raw.split(",") if e.strip()]
+    if not extensions:
+        raise ValueError("No extensions provided.")
+    return extensions
+
+
+def _prompt_extensions(example: str) -> list[str]:
+    """Ask for extensions until the answer parses."""
+    while True:
+        try:
+            return _parse_extensions(_ask(f"  Extensions (comma-separated, e.g. {example}): "))
+        except ValueError as e:
+            print(f"  ✗ {e}")
+
+
+def _prompt_scope_selection(
+    heading: str, prompt: str, ext_example: str,
+) -> tuple[list[TargetScope], list[str]]:
+    """
+    Show the scope menu and ask until the selection parses; extensions are
+    only asked for when EXTENSION was chosen.  Returns (scopes, extensions).
+    """
+    _render((
+        f"\n  {heading}",
+        "    1 → All files  (*)",
+        "    2 → Directories",
+        "    3 → Directory background",
+        "    4 → Specific extensions",
+    ))
+    # Re-prompt on bad input rather than failing after the whole form
+    while True:
+        try:
+            scopes = _parse_scopes(_ask(f"  {prompt}: "))
+            break
+        except ValueError as e:
+            print(f"  ✗ {e}")
+
+    extensions = _prompt_extensions(ext_example) if TargetScope.EXTENSION in scopes else []
+    return scopes, extensions
+
+
+def _ask(prompt: str) -> str:
+    """
+    `input()` for a terminal; for piped stdin (scripted answers) write the
+    prompt and read a raw line, skipping the readline machinery.
+    """
+    if sys.stdin.isatty():
+        return input(prompt)
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError  # same as input() — don't let re-prompt loops spin
+    return line.rstrip("\r\n")
+
+
+def _render(lines: Iterable[str]) -> None:
+    """Write a block of lines in one stdout write instead of a print per line."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+# The picker thread owns one hidden Tk root for the whole process —
+# Tk objects may only be touched from the thread that created them.
+_picker_jobs: queue.Queue = queue.Queue()
+_picker_thread: threading.Thread | None = None
+
+
+def _picker_loop() -> None:
+    """Serve file-dialog requests on one persistent Tk root until a None sentinel."""
+    root = None
+    while (reply := _picker_jobs.get()) is not None:
+        path = ""
+        try:
+            import tkinter as tk
+            from tkinter import filedialog
+
+            if root is None:  # Tcl/Tk start-up is paid once, not per pick
+                root = tk.Tk()
+                root.withdraw()          # Hide the empty tkinter window
+                root.attributes("-topmost", True)  # Dialog appears on top
+            path = filedialog.askopenfilename(
+                parent=root,
+                title="Select Application (.exe)",
+                filetypes=[("Executables", "*.exe"), ("All Files", "*.*")],
+            )
+        except Exception:
+            log.exception("File picker failed")
+        reply.put(path)  # always unblock the caller
+    if root is not None:
+        root.destroy()
+
+
+def _stop_picker() -> None:
+    if _picker_thread is not None and _picker_thread.is_alive():
+        _picker_jobs.put(None)
+        _picker_thread.join(timeout=1.0)
+
 
 def _pick_exe_file() -> str | None:
-    """Open a native Windows file dialog to select an .exe file."""
-    import tkinter as tk
-    from tkinter import filedialog
-
-    root = tk.Tk()
-    root.withdraw()          # Hide the empty tkinter window
-    root.attributes("-topmost", True)  # Dialog appears on top
-    path = filedialog.askopenfilename(
-        title="Select Application (.exe)",
-        filetypes=[("Executables", "*.exe"), ("All Files", "*.*")],
-    )
-    root.destroy()
+    """
+    Open a native Windows file dialog to select an .exe file.
+    The dialog runs on the picker thread; this thread just animates a spinner.
+    """
+    global _picker_thread
+    if _picker_thread is None:
+        _picker_thread = threading.Thread(target=_picker_loop, daemon=True)
+        _picker_thread.start()
+        atexit.register(_stop_picker)
+
+    q: queue.Queue = queue.Queue()
+    _picker_jobs.put(q)
+
+    for tick in itertools.cycle("|/-\\"):
+        try:
+            path = q.get(timeout=0.1)
+            break
+        except queue.Empty:
+            print(f"\r  Waiting for file picker… {tick}", end="", flush=True)
+    print("\r" + " " * 40 + "\r", end="", flush=True)  # clear the spinner line
     return path or None
 
 
+@functools.lru_cache(maxsize=512)
 def _derive_app_name(exe_path: str) -> str:
     """
     Derive a clean app name from the exe filename.
     'sublime_text.exe' → 'Sublime Text'
     'Code.exe'         → 'Code'
     """
-    from pathlib import Path
     stem = Path(exe_path).stem                    # 'sublime_text'
     return stem.replace("_", " ").replace("-", " ").title()
 
 
-def _build_custom_entry() -> MenuEntry:
+def _build_custom_entry() -> MenuEntry | None:
     """
     Interactive prompt to build a MenuEntry from user input.
     Auto-opens Explorer to pick the .exe, then derives key_name,
-    display_name, and icon automatically.
+    display_name, and icon automatically.  Returns None if the
+    file picker is cancelled.
     """
-    print("\n╔══════════════════════════════════════════╗")
-    print("║   Windows Context Menu Creator — Setup   ║")
-    print("╚══════════════════════════════════════════╝\n")
+    print(f"\n{_BANNER_SETUP}\n")
 
     # ── Step 1: Pick the executable ─────────────────────────────
     print("  Press Enter to open file picker, or paste a path directly.")
-    manual = input("  Full path to .exe: ").strip()
+    manual = _ask("  Full path to .exe: ").strip()
     if manual:
         exe_path = manual
     else:
         exe_path = _pick_exe_file()
         if not exe_path:
-            print("  ✗ No file selected. Aborting.")
-            sys.exit(1)
+            print("  ✗ No file selected.")
+            return None
         print(f"  ✔ Selected: {exe_path}")
 
     # ── Step 2: Auto-derive names ───────────────────────────────
@@ -75,32 +250,16 @@ def _build_custom_entry() -> MenuEntry:
     default_display = f"Open with {app_name}"         # "Open with Sublime Text"
     default_icon = f"{exe_path},0"                    # Use the exe's first icon
 
-    key_name = input(f"  Registry key name [{default_key}]: ").strip() or default_key
-    display_name = input(f"  Display label [{default_display}]: ").strip() or default_display
-    icon_input = input(f"  Icon path [{default_icon}]: ").strip()
+    key_name = _ask(f"  Registry key name [{default_key}]: ").strip() or default_key
+    display_name = _ask(f"  Display label [{default_display}]: ").strip() or default_display
+    icon_input = _ask(f"  Icon path [{default_icon}]: ").strip()
     icon = icon_input if icon_input else default_icon
 
-    print("\n  Target scopes:")
-    print("    1 → All files  (*)          ")
-    print("    2 → Directories             ")
-    print("    3 → Directory background    ")
-    print("    4 → Specific extensions     ")
-    scope_input = input("  Choose scopes (comma-separated, e.g. 1,2): ").strip()
-
-    scope_map = {
-        "1": TargetScope.ALL_FILES,
-        "2": TargetScope.DIRECTORY,
-        "3": TargetScope.DIR_BACKGROUND,
-        "4": TargetScope.EXTENSION,
-    }
-    scopes = [scope_map[s.strip()] for s in scope_input.split(",") if s.strip() in scope_map]
-
-    extensions: list[str] = []
-    if TargetScope.EXTENSION in scopes:
-        ext_input = input("  Extensions (comma-separated, e.g. .txt,.py): ").strip()
-        extensions = [e.strip() for e in ext_input.split(",") if e.strip()]
-
-    cmd_template = input(
+    scopes, extensions = _prompt_scope_selection(
+        "Target scopes:", "Choose scopes (comma-separated, e.g. 1,2)", ".txt,.py",
+    )
+
+    cmd_template = _ask(
         '  Command template (default: "{exe_path}" "{target}"): '
     ).strip()
     if not cmd_template:
@@ -117,49 +276,43 @@ def _build_custom_entry() -> MenuEntry:
     )
 
 
+def _collect_keys_by_scope(manager: RegistryManager) -> dict[str, list[TargetScope]]:
+    """Map each listed key to the scopes it lives in (one registry pass, first-seen order)."""
+    key_to_scopes: dict[str, list[TargetScope]] = {}
+    for scope, lst in manager.list_entries_bulk(_LISTED_SCOPES).items():
+        for k in lst:
+            key_to_scopes.setdefault(k, []).append(scope)
+    return key_to_scopes
+
+
 def _interactive_remove(manager: RegistryManager) -> None:
     """
     Show all existing context-menu entries with numbered IDs,
     then let the user pick by number to remove.
     """
-    # Collect entries from all scopes
-    scope_entries: dict[TargetScope, list[str]] = {}
-    all_keys: list[str] = []  # ordered, unique
-
-    for scope in (TargetScope.ALL_FILES, TargetScope.DIRECTORY, TargetScope.DIR_BACKGROUND):
-        entries = manager.list_entries(scope)
-        scope_entries[scope] = entries
-        for e in entries:
-            if e not in all_keys:
-                all_keys.append(e)
+    key_to_scopes = _collect_keys_by_scope(manager)
+    all_keys = list(key_to_scopes)
 
     if not all_keys:
         print("\n  No context-menu entries found.")
         return
 
     # Display numbered list with scope tags
-    scope_labels = {
-        TargetScope.ALL_FILES:      "*",
-        TargetScope.DIRECTORY:      "Dir",
-        TargetScope.DIR_BACKGROUND: "DirBG",
-    }
-
-    print("\n╔══════════════════════════════════════════╗")
-    print("║       Existing Context Menu Entries      ║")
-    print("╚══════════════════════════════════════════╝\n")
-
+    lines = [
+        "",
+        _BANNER_REMOVE,
+        "",
+    ]
     for idx, key in enumerate(all_keys, 1):
         # Show which scopes this key exists in
-        tags = [
-            label for scope, label in scope_labels.items()
-            if key in scope_entries.get(scope, [])
-        ]
+        tags = [_SCOPE_LABELS_SHORT[s] for s in key_to_scopes[key]]
         tag_str = ", ".join(tags)
-        print(f"  {idx:3d} │ {key:<35s} [{tag_str}]")
+        lines.append(f"  {idx:3d} │ {key:<35s} [{tag_str}]")
+    lines.append("")
+    _render(lines)
 
     # Ask for the number
-    print()
-    choice = input("  Enter number to remove (or 'q' to cancel): ").strip()
+    choice = _ask("  Enter number to remove (or 'q' to cancel): ").strip()
     if choice.lower() == "q" or not choice:
         print("  Cancelled.")
         return
@@ -175,15 +328,14 @@ def _interactive_remove(manager: RegistryManager) -> None:
     key_name = all_keys[idx]
 
     # Confirm
-    confirm = input(f"  Remove '{key_name}' from all scopes? [y/N]: ").strip().lower()
+    confirm = _ask(f"  Remove '{key_name}' from all scopes? [y/N]: ").strip().lower()
     if confirm != "y":
         print("  Cancelled.")
         return
 
     # Find which scopes contain this key and remove from all of them
-    target_scopes = [s for s, entries in scope_entries.items() if key_name in entries]
+    target_scopes = key_to_scopes[key_name]
 
-    from config import MenuEntry
     entry = MenuEntry(
         key_name=key_name,
         display_name="",
@@ -195,23 +347,15 @@ def _interactive_remove(manager: RegistryManager) -> None:
 
 def _list_entries(manager: RegistryManager) -> None:
     """Display all existing shell entries grouped by scope."""
-    scope_labels = {
-        TargetScope.ALL_FILES:      "All Files (*)",
-        TargetScope.DIRECTORY:      "Directory",
-        TargetScope.DIR_BACKGROUND: r"Directory\Background",
-    }
-
-    found = False
-    for scope, label in scope_labels.items():
-        entries = manager.list_entries(scope)
+    lines: list[str] = []
+    scope_entries = manager.list_entries_bulk(_LISTED_SCOPES)
+    for scope, label in _SCOPE_LABELS.items():
+        entries = scope_entries[scope]
         if entries:
-            found = True
-            print(f"\n  ── {label} ──")
-            for name in entries:
-                print(f"     • {name}")
+            lines.append(f"\n  ── {label} ──")
+            lines.extend(f"     • {name}" for name in entries)
 
-    if not found:
-        print("\n  No context-menu entries found.")
+    _render(lines or ["\n  No context-menu entries found."])
 
 
 def _interactive_edit(manager: RegistryManager) -> None:
@@ -219,37 +363,25 @@ def _interactive_edit(manager: RegistryManager) -> None:
     Pick an existing entry, show its current details,
     then let the user change the target scopes.
     """
-    # Collect all entries
-    scope_entries: dict[TargetScope, list[str]] = {}
-    all_keys: list[str] = []
-
-    scope_labels_short = {
-        TargetScope.ALL_FILES:      "*",
-        TargetScope.DIRECTORY:      "Dir",
-        TargetScope.DIR_BACKGROUND: "DirBG",
-    }
-
-    for scope in (TargetScope.ALL_FILES, TargetScope.DIRECTORY, TargetScope.DIR_BACKGROUND):
-        entries = manager.list_entries(scope)
-        scope_entries[scope] = entries
-        for e in entries:
-            if e not in all_keys:
-                all_keys.append(e)
+    key_to_scopes = _collect_keys_by_scope(manager)
+    all_keys = list(key_to_scopes)
 
     if not all_keys:
         print("\n  No context-menu entries found.")
         return
 
-    print("\n╔══════════════════════════════════════════╗")
-    print("║         Select Entry to Edit             ║")
-    print("╚══════════════════════════════════════════╝\n")
-
+    lines = [
+        "",
+        _BANNER_EDIT,
+        "",
+    ]
     for idx, key in enumerate(all_keys, 1):
-        tags = [lbl for s, lbl in scope_labels_short.items() if key in scope_entries.get(s, [])]
-        print(f"  {idx:3d} │ {key:<35s} [{', '.join(tags)}]")
+        tags = [_SCOPE_LABELS_SHORT[s] for s in key_to_scopes[key]]
+        lines.append(f"  {idx:3d} │ {key:<35s} [{', '.join(tags)}]")
+    lines.append("")
+    _render(lines)
 
-    print()
-    choice = input("  Enter number to edit (or 'q' to cancel): ").strip()
+    choice = _ask("  Enter number to edit (or 'q' to cancel): ").strip()
     if choice.lower() == "q" or not choice:
         print("  Cancelled.")
         return
@@ -263,7 +395,7 @@ def _interactive_edit(manager: RegistryManager) -> None:
         return
 
     key_name = all_keys[idx]
-    current_scopes = [s for s, entries in scope_entries.items() if key_name in entries]
+    current_scopes = key_to_scopes[key_name]
 
     # Read details from the first scope it exists in
     details = manager.read_entry_details(current_scopes[0], key_name)
@@ -272,50 +404,25 @@ def _interactive_edit(manager: RegistryManager) -> None:
         return
 
     # Show current details
-    cur_tags = [scope_labels_short[s] for s in current_scopes]
-    print(f"\n  ── Current Config for '{key_name}' ──")
-    print(f"     Display : {details['display_name']}")
-    print(f"     Icon    : {details['icon'] or '(none)'}")
-    print(f"     Command : {details['command']}")
-    print(f"     Scopes  : {', '.join(cur_tags)}")
+    cur_tags = [_SCOPE_LABELS_SHORT[s] for s in current_scopes]
+    _render((
+        f"\n  ── Current Config for '{key_name}' ──",
+        f"     Display : {details['display_name']}",
+        f"     Icon    : {details['icon'] or '(none)'}",
+        f"     Command : {details['command']}",
+        f"     Scopes  : {', '.join(cur_tags)}",
+    ))
 
     # Ask for new scopes
-    print("\n  New target scopes:")
-    print("    1 → All files  (*)")
-    print("    2 → Directories")
-    print("    3 → Directory background")
-    print("    4 → Specific extensions")
-    scope_input = input("  Choose new scopes (comma-separated, e.g. 4): ").strip()
-
-    scope_map = {
-        "1": TargetScope.ALL_FILES,
-        "2": TargetScope.DIRECTORY,
-        "3": TargetScope.DIR_BACKGROUND,
-        "4": TargetScope.EXTENSION,
-    }
-    new_scopes = [scope_map[s.strip()] for s in scope_input.split(",") if s.strip() in scope_map]
-
-    if not new_scopes:
-        print("  ✗ No valid scopes selected.")
-        return
-
-    extensions: list[str] = []
-    if TargetScope.EXTENSION in new_scopes:
-        ext_input = input("  Extensions (comma-separated, e.g. .py,.js,.html): ").strip()
-        extensions = [e.strip() for e in ext_input.split(",") if e.strip()]
-        if not extensions:
-            print("  ✗ No extensions provided.")
-            return
+    new_scopes, extensions = _prompt_scope_selection(
+        "New target scopes:", "Choose new scopes (comma-separated, e.g. 4)", ".py,.js,.html",
+    )
 
     # Extract exe_path from the existing command (between first pair of quotes)
-    cmd = details["command"] or ""
-    if cmd.startswith('"'):
-        exe_path = cmd.split('"')[1]
-    else:
-        exe_path = cmd.split()[0] if cmd else ""
+    m = _EXE_RE.match(details["command"] or "")
+    exe_path = (m.group(1) or m.group(2) or "") if m else ""
 
     # Step 1: Remove from ALL old scopes
-    from config import MenuEntry
     old_entry = MenuEntry(
         key_name=key_name,
         display_name=details["display_name"],
@@ -335,81 +442,173 @@ def _interactive_edit(manager: RegistryManager) -> None:
     )
     manager.add_entry(new_entry)
 
-    new_tags = [scope_labels_short.get(s, "Ext") for s in new_scopes]
+    new_tags = [_SCOPE_LABELS_SHORT.get(s, "Ext") for s in new_scopes]
     if extensions:
         print(f"\n  ✔ '{key_name}' updated: [{', '.join(cur_tags)}] → [{', '.join(new_tags)}] ({', '.join(extensions)})")
     else:
         print(f"\n  ✔ '{key_name}' updated: [{', '.join(cur_tags)}] → [{', '.join(new_tags)}]")
 
 
-def main() -> None:
-    manager_ro = RegistryManager(dry_run=False)
-    is_classic = manager_ro.is_classic_menu_forced()
-    status_icon = "🟢 ON" if is_classic else "🔴 OFF"
+# ── Menu actions ────────────────────────────────────────────────
+
+def _do_add(manager: RegistryManager) -> None:
+    """Build one or more entries interactively, then register them together."""
+    first = _build_custom_entry()
+    if first is None:
+        print("  Aborting.")
+        sys.exit(1)
+    entries = [first]
+    while _ask("\n  Add another entry? [y/N]: ").strip().lower() == "y":
+        entry = _build_custom_entry()
+        if entry is None:
+            # A cancelled pick ends the batch; don't lose what was collected
+            n = len(entries)
+            prompt = f"  Register the {n} entr{'y' if n == 1 else 'ies'} collected so far? [Y/n]: "
+            if _ask(prompt).strip().lower() == "n":
+                print(f"  ✗ Discarded {n} entr{'y' if n == 1 else 'ies'}.")
+                return
+            break
+        entries.append(entry)
+    # One admin check and one registry transaction for the batch
+    manager.add_entries(entries)
+
+
+def _do_toggle_menu(manager: RegistryManager) -> None:
+    """Flip between the Win11 compact menu and the classic full menu."""
+    # Probed only here, so the other options skip the registry read
+    is_classic = manager.is_classic_menu_forced()
+    print(f"\n  Classic menu is currently {'🟢 ON' if is_classic else '🔴 OFF'}.")
+    if is_classic:
+        print("  Restoring modern Win11 compact menu…")
+        manager.restore_modern_menu()
+    else:
+        print("  Forcing classic full menu (Win10 style)…")
+        manager.force_classic_menu()
+
+    restart = _ask("  Restart Explorer now to apply? [y/N]: ").strip().lower()
+    if restart == "y":
+        manager.restart_explorer()
+        print("  ✔ Done! Right-click to see the change.")
+    else:
+        print("  ⚠ Change saved. Restart Explorer manually or reboot to apply.")
+
+
+def _do_exit(manager: RegistryManager) -> None:
+    print("  Bye!")
+
+
+# Menu option → action; every action takes the shared manager
+_DISPATCH: dict[str, Callable[[RegistryManager], None]] = {
+    "1": _do_add,
+    "2": _interactive_remove,
+    "3": _list_entries,
+    "4": _interactive_edit,
+    "5": _do_toggle_menu,
+    "6": _do_exit,
+}
 
-    print("\n╔══════════════════════════════════════════╗")
-    print("║   Windows Context Menu Creator  v1.0     ║")
-    print("╚══════════════════════════════════════════╝")
+
+def _exit_admin_required() -> NoReturn:
+    print("\n  ✗ This operation requires Administrator privileges.")
+    print("    Right-click your terminal → 'Run as administrator'.")
+    sys.exit(1)
+
+
+def main() -> None:
+    print(f"\n{_BANNER_MAIN}")
     print()
     print("  1 → Add new entry")
     print("  2 → Remove an entry")
     print("  3 → List existing entries")
     print("  4 → Edit an entry (change scopes)")
-    print(f"  5 → Toggle Win11 Classic Menu [{status_icon}]")
+    print("  5 → Toggle Win11 Classic Menu")
     print("  6 → Exit")
     print()
 
-    choice = input("  Choose an option [1-6]: ").strip()
+    choice = _ask("  Choose an option [1-6]: ").strip()
+    if choice not in _DISPATCH:
+        print(f"  ✗ Invalid option: '{choice}'")
+        sys.exit(1)
 
+    # One manager for the whole invocation — construction touches no registry
+    manager = RegistryManager(dry_run=False)
+
+    try:
+        # Check elevation before any prompts, not after the user fills them in
+        if choice in _ADMIN_CHOICES:
+            require_admin()
+
+        _DISPATCH[choice](manager)
+    except PermissionError:
+        _exit_admin_required()
+
+
+_CONFIG_STR_FIELDS = ("key_name", "display_name", "exe_path", "command_template")
+_CONFIG_LIST_FIELDS = ("scopes", "extensions")
+
+
+def _entry_from_config(i: int, d: object) -> MenuEntry:
+    """Build config entry `i`, raising ValueError with the entry index on bad input."""
+    if not isinstance(d, dict):
+        raise ValueError(f"entry {i} must be a JSON object")
+    for name in _CONFIG_STR_FIELDS:
+        if name in d and not isinstance(d[name], str):
+            raise ValueError(f"entry {i}: {name} must be a string")
+    if d.get("icon") is not None and not isinstance(d["icon"], str):
+        raise ValueError(f"entry {i}: icon must be a string or null")
+    for name in _CONFIG_LIST_FIELDS:
+        if name in d and not (
+            isinstance(d[name], list) and all(isinstance(v, str) for v in d[name])
+        ):
+            raise ValueError(f"entry {i}: {name} must be a list of strings")
+
+    scopes = []
+    for n in d.get("scopes", ["all_files"]):
+        try:
+            scopes.append(TargetScope[n.upper()])
+        except KeyError:
+            raise ValueError(f"entry {i}: unknown scope '{n}'") from None
     try:
-        if choice == "1":
-            manager = RegistryManager(dry_run=False)
-            entry = _build_custom_entry()
-            manager.add_entry(entry)
-
-        elif choice == "2":
-            manager = RegistryManager(dry_run=False)
-            _interactive_remove(manager)
-
-        elif choice == "3":
-            manager = RegistryManager(dry_run=False)
-            _list_entries(manager)
-
-        elif choice == "4":
-            manager = RegistryManager(dry_run=False)
-            _interactive_edit(manager)
-
-        elif choice == "5":
-            manager = RegistryManager(dry_run=False)
-            if is_classic:
-                print("\n  Restoring modern Win11 compact menu…")
-                manager.restore_modern_menu()
-            else:
-                print("\n  Forcing classic full menu (Win10 style)…")
-                manager.force_classic_menu()
-
-            restart = input("  Restart Explorer now to apply? [y/N]: ").strip().lower()
-            if restart == "y":
-                manager.restart_explorer()
-                print("  ✔ Done! Right-click to see the change.")
-            else:
-                print("  ⚠ Change saved. Restart Explorer manually or reboot to apply.")
-
-        elif choice == "6":
-            print("  Bye!")
-
-        else:
-            print(f"  ✗ Invalid option: '{choice}'")
-            sys.exit(1)
+        return MenuEntry(**{**d, "scopes": scopes})
+    except TypeError as e:  # missing or unknown fields
+        raise ValueError(f"entry {i}: {e}") from None
 
+
+def _apply_config(path: str) -> None:
+    """
+    Non-interactive batch mode: register every entry in a JSON file.
+
+    The file holds a list of MenuEntry field dicts; `scopes` are given by
+    name, e.g. ["all_files", "directory"].  All entries go through one
+    `add_entries` call (one admin check, one registry transaction).
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+        if not isinstance(raw, list):
+            raise ValueError("config must be a JSON array")
+        entries = [_entry_from_config(i, d) for i, d in enumerate(raw)]
+    except (OSError, ValueError, TypeError) as e:
+        print(f"  ✗ Invalid config '{path}': {e}")
+        sys.exit(1)
+
+    try:
+        RegistryManager(dry_run=False).add_entries(entries)
     except PermissionError:
-        print("\n  ✗ This operation requires Administrator privileges.")
-        print("    Right-click your terminal → 'Run as administrator'.")
+        _exit_admin_required()
+    except FileNotFoundError as e:  # exe/icon validation — nothing was written
+        print(f"  ✗ {e}")
         sys.exit(1)
+    print(f"  ✔ Applied {len(entries)} entr{'y' if len(entries) == 1 else 'ies'} from '{path}'.")
 
 
 if __name__ == "__main__":
-    if "--gui" in sys.argv or getattr(sys, 'frozen', False):
+    if sys.argv[1:2] == ["apply"]:
+        if len(sys.argv) < 3:
+            print("  Usage: python main.py apply <entries.json>")
+            sys.exit(2)
+        _apply_config(sys.argv[2])
+    elif "--gui" in sys.argv or getattr(sys, 'frozen', False):
         from app.gui import launch
         launch()
     elif "--browser" in sys.argv: